@@ -11,7 +11,7 @@ import sys
 import os
 from pathlib import Path
 from multiprocessing import Pool, cpu_count
-from typing import Tuple, List, Optional, Any
+from typing import Tuple, List, Optional, Any, Dict
 import re
 import json
 
@@ -22,7 +22,10 @@ from validator.catalog_db import init_db, save_part, PartInfo, DB_PATH
 from validator.config import get_parts_dir, get_p_dir
 from validator.parser import parse_line
 from validator.geometry import transform_point_by_matrix
-from validator.shadow_parser import ShadowParser
+from validator.shadow_parser import shared_parser
+
+# LDCad shadow library (connectivity metadata), relative to the project root
+SHADOW_LIB_PATH = str(Path(__file__).parent.parent / "data" / "offLibShadow")
 
 # Primitives that indicate connection points
 STUD_PRIMITIVES = {
@@ -36,6 +39,35 @@ TECHNIC_HOLE_PRIMITIVES = {
     "connect.dat", "connect2.dat", "connect3.dat"
 }
 
+# Library search order for sub-file references (first match wins)
+_PATH_INDEX: Optional[Dict[str, Path]] = None
+
+def get_path_index() -> Dict[str, Path]:
+    """
+    Lowercase filename -> path over parts/, p/, parts/s/ and p/48/.
+    Built once per process with os.scandir, so resolving a sub-file
+    reference is a dict lookup instead of several stat calls.
+    """
+    global _PATH_INDEX
+    if _PATH_INDEX is None:
+        path_index = {}
+        for d in (get_parts_dir(), get_p_dir(), get_parts_dir() / "s", get_p_dir() / "48"):
+            try:
+                with os.scandir(d) as it:
+                    for entry in it:
+                        if entry.is_file():
+                            path_index.setdefault(entry.name.lower(), Path(entry.path))
+            except OSError:
+                continue
+        _PATH_INDEX = path_index
+    return _PATH_INDEX
+
+def resolve_part_path(part_path: Path) -> Optional[Path]:
+    """Resolve an absolute part path or a sub-file reference like 's/3001s01.dat'."""
+    if part_path.is_absolute():
+        return part_path if part_path.exists() else None
+    return get_path_index().get(part_path.name.lower())
+
 
 
 
@@ -129,19 +161,9 @@ def get_recursive_primitives(part_path: Path, matrix: Tuple[float, ...] = None,
     
     try:
         # Resolve path if checking relative include (though we usually pass absolute)
-        if not part_path.exists():
-            # Try finding in library search paths
-            from validator.config import get_parts_dir, get_p_dir
-            search_paths = [get_parts_dir(), get_p_dir()]
-            found = False
-            for sp in search_paths:
-                 candidate = sp / part_path.name
-                 if candidate.exists():
-                     part_path = candidate
-                     found = True
-                     break
-            if not found:
-                return []
+        part_path = resolve_part_path(part_path)
+        if part_path is None:
+            return []
 
         with open(part_path, 'r', encoding='utf-8', errors='ignore') as f:
             for line in f:
@@ -202,27 +224,9 @@ def find_primitives_recursive(part_path: Path, current_pos: Tuple[float, float,
     
     try:
         # Resolve file path
-        actual_path = part_path
-        if not actual_path.exists():
-            # Try parts/ and p/
-            from validator.config import get_parts_dir, get_p_dir
-            # Heuristic: try parts/filename, p/filename, parts/s/filename, p/s/filename
-            # But usually we just check if it exists in parts list.
-            # Using simple check:
-            candidates = [
-                 get_parts_dir() / part_path.name,
-                 get_p_dir() / part_path.name,
-                 get_parts_dir() / "s" / part_path.name,
-                 get_p_dir() / "48" / part_path.name # low res?
-            ]
-            for c in candidates:
-                # print(f"Checking {c} ... {c.exists()}")
-                if c.exists():
-                    actual_path = c
-                    break
-            else:
-                # print(f"Could not resolve {part_path}")
-                return [] # file not found
+        actual_path = resolve_part_path(part_path)
+        if actual_path is None:
+            return [] # file not found
     
         # print(f"Scanning {actual_path}")
         with open(actual_path, 'r', encoding='utf-8', errors='ignore') as f:
@@ -307,21 +311,9 @@ def calculate_bounds_recursive(part_path: Path, current_pos: Tuple[float, float,
 
     try:
         # Resolve path
-        actual_path = part_path
-        if not actual_path.exists():
-            from validator.config import get_parts_dir, get_p_dir
-            candidates = [
-                 get_parts_dir() / part_path.name,
-                 get_p_dir() / part_path.name,
-                 get_parts_dir() / "s" / part_path.name,
-                 get_p_dir() / "48" / part_path.name
-            ]
-            for c in candidates:
-                if c.exists():
-                    actual_path = c
-                    break
-            else:
-                return None
+        actual_path = resolve_part_path(part_path)
+        if actual_path is None:
+            return None
 
         with open(actual_path, 'r', encoding='utf-8', errors='ignore') as f:
             for line in f:
@@ -561,11 +553,8 @@ def process_part(part_path: str) -> dict:
     
     if result:
         # --- Shadow Library Integration ---
-        # Initialize parser relative to the project root
-        project_root = Path(__file__).parent.parent
-        shadow_lib_path = project_root / "data" / "offLibShadow"
-        
-        shadow_parser = ShadowParser(str(shadow_lib_path))
+        # One parser per worker process, so the shadow library is indexed once
+        shadow_parser = shared_parser(SHADOW_LIB_PATH)
         
         # 1. Get explicit connections for the part itself (e.g. tubes)
         relative_path = f"parts/{result.part_id}.dat"
@@ -654,6 +643,9 @@ def main():
     conn = init_db()
     print(f"Database: {DB_PATH}")
     
+    # Build the sub-file index before forking so workers inherit it
+    get_path_index()
+    
     # Process in parallel
     num_workers = max(1, cpu_count() - 1)
     print(f"Processing with {num_workers} workers...")
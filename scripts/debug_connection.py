@@ -1,5 +1,6 @@
 from pathlib import Path
 import sys
+import numpy as np
 
 # Add src to path
 sys.path.append(str(Path(__file__).parent.parent / "src"))
@@ -8,7 +9,6 @@ from validator.scene_graph import SceneGraph
 from validator.loader import Loader
 from validator.catalog_db import get_part
 from validator.geometry import get_world_studs, get_world_antistuds
-from validator.connections import studs_connect
 
 def debug_connection():
     file_path = Path("test_data/valid/1.1_stacked_bricks.ldr")
@@ -39,27 +39,21 @@ def debug_connection():
     
     # Check for connection between Studs 0 and AntiStuds 1
     print("\nChecking P0 Studs -> P1 AntiStuds:")
-    connected = False
-    for s in studs0:
-        for a in antistuds1:
-            if studs_connect(s, a, tolerance=2.0): # Relaxed tolerance for debug
-                print(f"  MATCH! Stud {s} - Anti {a}")
-                connected = True
-                break
-        if connected: break
-        
-    if not connected:
+    # (n_studs, n_antistuds) distances, all pairs at once
+    dist = np.linalg.norm(studs0[:, None, :] - antistuds1[None, :, :], axis=-1)
+    if not dist.size:
+        print("  NO POINTS TO COMPARE.")
+        return
+    
+    matches = np.argwhere(dist <= 2.0) # Relaxed tolerance for debug
+    if len(matches):
+        s, a = matches[0]
+        print(f"  MATCH! Stud {studs0[s]} - Anti {antistuds1[a]}")
+    else:
         print("  NO MATCH FOUND.")
         # Print closest pair
-        min_dist = 9999
-        closest = None
-        for s in studs0:
-            for a in antistuds1:
-                dist = sum((x-y)**2 for x,y in zip(s,a))**0.5
-                if dist < min_dist:
-                    min_dist = dist
-                    closest = (s, a)
-        print(f"  Closest pair: {closest} Dist: {min_dist}")
+        s, a = np.unravel_index(dist.argmin(), dist.shape)
+        print(f"  Closest pair: {(studs0[s], antistuds1[a])} Dist: {dist[s, a]}")
 
 if __name__ == "__main__":
     debug_connection()
@@ -29,7 +29,16 @@ from .connections import build_connection_graph
 from .grounding import validate_grounding
 from .scene_graph import SceneGraph
 from .loader import Loader
-from .renderer import render_scene
+from .checks import validate_stud_grid
+
+
+def __getattr__(name: str):
+    # The renderer shells out to LDView and isn't needed for validation,
+    # so it is only imported on first use of validator.render_scene.
+    if name == "render_scene":
+        from .renderer import render_scene
+        return render_scene
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def validate_moc(file_path: Path) -> ValidationResult:
     """
@@ -61,21 +70,15 @@ def validate_moc(file_path: Path) -> ValidationResult:
         ))
     
     # 1.5. Check Grid Alignment
-    from validator.checks import validate_grid_alignment
-    from validator.catalog_db import get_part
-    
+    # World studs were baked by the loader (SceneGraph.finalize)
     for i, p in enumerate(placements):
-        try:
-            part_info = get_part(p.part_id)
-            warnings = validate_grid_alignment(p, part_info)
-            for w in warnings:
-                errors.append(ValidationError(
-                    error_type="grid_alignment",
-                    message=f"Part {i} ({p.part_id}): {w}",
-                    brick_indices=[i]
-                ))
-        except KeyError:
-             pass 
+        warnings = validate_stud_grid(sg.world_studs_of(i))
+        for w in warnings:
+            errors.append(ValidationError(
+                error_type="grid_alignment",
+                message=f"Part {i} ({p.part_id}): {w}",
+                brick_indices=[i]
+            ))
 
     # 2. Build connection graph
     # Returns List[Tuple[int, int]]
@@ -5,9 +5,11 @@ Stores connection points, bounds, and classification for all parts.
 
 import sqlite3
 import json
+from itertools import product
 from pathlib import Path
-from dataclasses import dataclass, asdict
-from typing import Optional, List, Tuple
+from dataclasses import dataclass, asdict, field
+from typing import Optional, List, Tuple, Dict, Iterable
+import numpy as np
 
 DB_PATH = Path(__file__).parent / "data" / "catalog.db"
 
@@ -30,6 +32,30 @@ class PartInfo:
     parents: List[str] = None
     connection_points: List[dict] = None  # List of dicts describing points
     connection_types: List[str] = None    # List of SNAP types found
+    
+    # (K, 3) float32 copies of studs / anti_studs for vectorized consumers.
+    # The list fields stay the serialized (JSON) form.
+    stud_array: np.ndarray = field(init=False, repr=False, compare=False)
+    anti_stud_array: np.ndarray = field(init=False, repr=False, compare=False)
+    # Connection points as parallel arrays, in the same order as connection_points:
+    # (K, 3) float32 positions, (K,) int8 GENDER_CODES and CONNECTION_TYPE_CODES
+    connection_point_array: np.ndarray = field(init=False, repr=False, compare=False)
+    connection_genders: np.ndarray = field(init=False, repr=False, compare=False)
+    connection_type_codes: np.ndarray = field(init=False, repr=False, compare=False)
+    # (8, 3) float32 corners of bounds, or None if bounds are incomplete
+    corners: Optional[np.ndarray] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.corners = _bounds_corners(self.bounds)
+        self.stud_array = _as_point_array(self.studs)
+        self.anti_stud_array = _as_point_array(self.anti_studs)
+        
+        cps = self.connection_points or []
+        self.connection_point_array = _as_point_array([cp['pos'] for cp in cps])
+        self.connection_genders = np.array(
+            [GENDER_CODES.get(cp.get('gender'), 0) for cp in cps], dtype=np.int8)
+        self.connection_type_codes = np.array(
+            [connection_type_code(cp.get('type')) for cp in cps], dtype=np.int8)
 
     @property
     def name(self) -> str:
@@ -37,6 +63,39 @@ class PartInfo:
         return self.part_id
 
 
+def _bounds_corners(bounds: Optional[dict]) -> Optional[np.ndarray]:
+    """The 8 corners of a {"x": (min, max), ...} bounds dict as a (8, 3) array."""
+    if not bounds or not all(axis in bounds for axis in ("x", "y", "z")):
+        return None
+    corners = np.array(list(product(bounds["x"], bounds["y"], bounds["z"])), dtype=np.float32)
+    corners.flags.writeable = False
+    return corners
+
+
+# Connection point gender codes; only M + F (sum 3) can snap together
+GENDER_CODES = {'U': 0, 'M': 1, 'F': 2}
+
+# Connection type codes, assigned in first-seen order beyond the known SNAP types
+CONNECTION_TYPE_CODES = {'SNAP_CYL': 0, 'SNAP_FGR': 1, 'SNAP_GEN': 2}
+
+def connection_type_code(conn_type: Optional[str]) -> int:
+    """Stable (per process) small integer for a connection type."""
+    return CONNECTION_TYPE_CODES.setdefault(conn_type, len(CONNECTION_TYPE_CODES))
+
+
+# Shared by every part with no points of a kind (tiles have no studs, etc.)
+EMPTY_POINTS = np.empty((0, 3), dtype=np.float32)
+EMPTY_POINTS.flags.writeable = False
+
+def _as_point_array(points) -> np.ndarray:
+    """Convert a list of [x, y, z] (or None) to a read-only (K, 3) float32 array."""
+    if points is None or len(points) == 0:
+        return EMPTY_POINTS
+    arr = np.asarray(points, dtype=np.float32).reshape(-1, 3)
+    arr.flags.writeable = False
+    return arr
+
+
 # Common stud primitives in LDraw (Moved from catalog.py)
 STUD_PRIMITIVES = {
     "stud.dat", "stud2.dat", "stud3.dat", "stud4.dat", "stud6.dat",
@@ -56,6 +115,18 @@ def get_part(part_id: str) -> Optional[PartInfo]:
         conn.close()
 
 
+def get_parts(part_ids: Iterable[str]) -> Dict[str, Optional[PartInfo]]:
+    """
+    Load several parts over one connection, e.g. every distinct part of a scene.
+    Returns {part_id: PartInfo or None if not in the catalog}.
+    """
+    conn = init_db()
+    try:
+        return load_parts(conn, part_ids)
+    finally:
+        conn.close()
+
+
 
 def init_db(db_path: Path = DB_PATH) -> sqlite3.Connection:
     """Initialize the SQLite database with schema."""
@@ -78,7 +149,6 @@ def init_db(db_path: Path = DB_PATH) -> sqlite3.Connection:
             studs_json TEXT,
             anti_studs_json TEXT,
             technic_holes_json TEXT,
-            technic_holes_json TEXT,
             extraction_status TEXT DEFAULT 'pending',
             connection_points_json TEXT,
             connection_types_json TEXT
@@ -134,6 +204,23 @@ def init_db(db_path: Path = DB_PATH) -> sqlite3.Connection:
     except sqlite3.OperationalError:
         pass
     
+    # Migrate to add precomputed connection counts, backfilled once from the JSON columns
+    try:
+        conn.execute("ALTER TABLE parts ADD COLUMN stud_count INTEGER")
+        conn.execute("ALTER TABLE parts ADD COLUMN anti_stud_count INTEGER")
+        conn.execute("ALTER TABLE parts ADD COLUMN technic_hole_count INTEGER")
+        conn.execute("ALTER TABLE parts ADD COLUMN connection_count INTEGER")
+        conn.execute("""
+            UPDATE parts SET
+                stud_count = COALESCE(json_array_length(NULLIF(studs_json, '')), 0),
+                anti_stud_count = COALESCE(json_array_length(NULLIF(anti_studs_json, '')), 0),
+                technic_hole_count = COALESCE(json_array_length(NULLIF(technic_holes_json, '')), 0),
+                connection_count = COALESCE(json_array_length(NULLIF(connection_points_json, '')), 0)
+        """)
+        conn.commit()
+    except sqlite3.OperationalError:
+        pass
+    
     # Create indices
     conn.execute("""
         CREATE INDEX IF NOT EXISTS idx_category ON parts(category)
@@ -150,6 +237,10 @@ def init_db(db_path: Path = DB_PATH) -> sqlite3.Connection:
     conn.execute("""
         CREATE INDEX IF NOT EXISTS idx_has_image ON parts(has_image)
     """)
+    # Common catalog filter combination, ordered by part_id for pagination
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_parts_filters ON parts(has_image, extraction_status, category, type, part_id)
+    """)
     conn.commit()
     return conn
 
@@ -177,8 +268,8 @@ def save_part(conn: sqlite3.Connection, part: PartInfo) -> None:
     
     conn.execute("""
         INSERT OR REPLACE INTO parts 
-        (part_id, part_name, type, category, ldraw_org, height, bounds_json, studs_json, anti_studs_json, technic_holes_json, extraction_status, has_image, image_path, metadata_json, subparts_json, parents_json, connection_points_json, connection_types_json)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        (part_id, part_name, type, category, ldraw_org, height, bounds_json, studs_json, anti_studs_json, technic_holes_json, extraction_status, has_image, image_path, metadata_json, subparts_json, parents_json, connection_points_json, connection_types_json, stud_count, anti_stud_count, technic_hole_count, connection_count)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
     """, (
         part.part_id,
         part.part_name,
@@ -197,19 +288,51 @@ def save_part(conn: sqlite3.Connection, part: PartInfo) -> None:
         json.dumps(part.subparts or []),
         json.dumps(part.parents or []),
         json.dumps(part.connection_points or []),
-        json.dumps(part.connection_types or [])
+        json.dumps(part.connection_types or []),
+        len(part.studs or []),
+        len(part.anti_studs or []),
+        len(part.technic_holes or []),
+        len(part.connection_points or [])
     ))
 
 
+_PART_COLUMNS = "part_id, part_name, type, category, ldraw_org, height, bounds_json, studs_json, anti_studs_json, technic_holes_json, extraction_status, metadata_json, subparts_json, parents_json, connection_points_json, connection_types_json"
+
+# Stay under SQLite's bound-parameter limit for IN (...) queries
+_MAX_QUERY_PARAMS = 900
+
+
 def load_part(conn: sqlite3.Connection, part_id: str) -> Optional[PartInfo]:
     """Load a part from the database."""
     cursor = conn.execute(
-        "SELECT part_id, part_name, type, category, ldraw_org, height, bounds_json, studs_json, anti_studs_json, technic_holes_json, extraction_status, metadata_json, subparts_json, parents_json, connection_points_json, connection_types_json FROM parts WHERE part_id = ?", (part_id,)
+        f"SELECT {_PART_COLUMNS} FROM parts WHERE part_id = ?", (part_id,)
     )
     row = cursor.fetchone()
     if not row:
         return None
     
+    return _row_to_part(row)
+
+
+def load_parts(conn: sqlite3.Connection, part_ids: Iterable[str]) -> Dict[str, Optional[PartInfo]]:
+    """Load many parts from the database with batched IN (...) queries."""
+    ids = list(dict.fromkeys(part_ids))
+    parts: Dict[str, Optional[PartInfo]] = dict.fromkeys(ids)
+    
+    for start in range(0, len(ids), _MAX_QUERY_PARAMS):
+        batch = ids[start:start + _MAX_QUERY_PARAMS]
+        placeholders = ", ".join("?" * len(batch))
+        cursor = conn.execute(
+            f"SELECT {_PART_COLUMNS} FROM parts WHERE part_id IN ({placeholders})", batch
+        )
+        for row in cursor:
+            parts[row[0]] = _row_to_part(row)
+    
+    return parts
+
+
+def _row_to_part(row: tuple) -> PartInfo:
+    """Build a PartInfo from a row selected with _PART_COLUMNS."""
     return PartInfo(
         part_id=row[0],
         part_name=row[1] or row[0],  # Fall back to ID if no name
@@ -237,7 +360,8 @@ def get_stats(conn: sqlite3.Connection) -> dict:
             COUNT(*) as total,
             SUM(CASE WHEN extraction_status = 'success' THEN 1 ELSE 0 END) as success,
             SUM(CASE WHEN extraction_status = 'partial' THEN 1 ELSE 0 END) as partial,
-            SUM(CASE WHEN extraction_status = 'failed' THEN 1 ELSE 0 END) as failed
+            SUM(CASE WHEN extraction_status = 'failed' THEN 1 ELSE 0 END) as failed,
+            SUM(CASE WHEN has_image = 1 THEN 1 ELSE 0 END) as with_images
         FROM parts
     """)
     row = cursor.fetchone()
@@ -245,7 +369,8 @@ def get_stats(conn: sqlite3.Connection) -> dict:
         "total": row[0],
         "success": row[1] or 0,
         "partial": row[2] or 0,
-        "failed": row[3] or 0
+        "failed": row[3] or 0,
+        "with_images": row[4] or 0
     }
 
 
@@ -1,35 +1,32 @@
 from typing import List, Tuple
+import numpy as np
 from validator.parser import Placement
 from validator.catalog_db import PartInfo
 from validator.geometry import get_world_studs
 
 def validate_grid_alignment(placement: Placement, part: PartInfo) -> List[str]:
     """Check if transformed studs land on valid positions."""
-    warnings = []
+    return validate_stud_grid(get_world_studs(placement, part))
+
+def validate_stud_grid(world_studs: np.ndarray) -> List[str]:
+    """
+    Grid check over an (S, 3) array of world studs (e.g. SceneGraph.world_studs_of).
+    """
+    if not len(world_studs):
+        return []
     
-    # We need to account for floating point errors, so we round to nearest reasonable precision
-    # before checking modulo. However, the user request specifically asked for modulo checks.
-    # Given the transformations, exact integer coordinates might be slightly off.
-    # But let's follow the user's logic first.
+    # Even-sized parts: studs should be at 10 mod 20
+    # Odd-sized parts: studs should be at 0 mod 20
+    # Rounding handles float imprecision from rotation. Then truncate like
+    # int() and wrap like Python's % (result has the sign of the divisor).
+    xz = np.trunc(np.round(world_studs[:, [0, 2]].astype(np.float64), 2))
+    xz_mod = np.mod(xz, 20)
+    on_grid = ((xz_mod == 0) | (xz_mod == 10)).all(axis=1)
     
-    for stud in get_world_studs(placement, part):
-        # Even-sized parts: studs should be at 10 mod 20
-        # Odd-sized parts: studs should be at 0 mod 20
-        # We need to handle negative coordinates correctly with modulo in Python.
-        # Python's % operator returns result with same sign as divisor (positive for 20).
-        
-        # Rounding to handle float imprecision from rotation
-        x = round(stud[0], 2)
-        z = round(stud[2], 2)
-        
-        x_mod = int(x) % 20
-        z_mod = int(z) % 20
-        
-        if not (x_mod in (0, 10) and z_mod in (0, 10)):
-            warnings.append(f"Stud at {stud} off-grid")
-            
-            
-    return warnings
+    return [
+        f"Stud at {tuple(round(v, 2) for v in stud)} off-grid"
+        for stud in world_studs[~on_grid].tolist()
+    ]
 
 def validate_collisions(scene_graph) -> List[str]:
     """Check for physical collisions between bricks."""
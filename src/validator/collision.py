@@ -1,106 +1,117 @@
-from typing import List, Tuple, Set
+from typing import List, Tuple, Set, Optional
+import numpy as np
+from validator import config
 from validator.scene_graph import SceneGraph
 from validator.geometry import get_world_aabb
+from validator.geometry_kernels import collide_pairs
 
-def check_collisions(scene_graph: SceneGraph) -> List[Tuple[int, int]]:
+# Below this many placements a brute-force all-pairs sweep is cheaper than
+# one spatial index query per placement plus Python-level pair dedup.
+SMALL_SCENE_THRESHOLD = 32
+
+# Narrow phase tolerances (LDU), shared by the scalar and vectorized paths.
+TOUCH_EPSILON = 0.05
+SHRINK_AMOUNT = 2.0
+# Shrinking both boxes by SHRINK_AMOUNT per side shrinks their overlap by twice that
+SHRUNK_OVERLAP_MIN = 2 * SHRINK_AMOUNT
+
+def check_collisions(scene_graph: SceneGraph, broad_phase: Optional[str] = None) -> List[Tuple[int, int]]:
     """
     Check for collisions between bricks in the scene graph.
     Returns a list of (index_a, index_b) tuples for colliding pairs.
+    
+    broad_phase selects "index" or "sap" for scenes above SMALL_SCENE_THRESHOLD;
+    defaults to config.COLLISION_BROAD_PHASE.
     """
-    collisions = []
+    num_parts = len(scene_graph.placements)
+    if num_parts < 2:
+        return []
     
-    # We will use the scene graph's broad-phase query to find potential candidates.
-    # However, since we need to check *every* pair, we can iterate through all placements
-    # and query the index for each one.
+    mins, maxs = scene_graph.aabb_arrays()
     
-    # To avoid duplicate reports (A vs B and B vs A), we can store processed pairs.
-    processed_pairs: Set[Tuple[int, int]] = set()
+    if num_parts < SMALL_SCENE_THRESHOLD:
+        # Small scene: test every pair at once, no spatial index needed
+        pair_i, pair_j = np.triu_indices(num_parts, k=1)
+    elif (broad_phase or config.COLLISION_BROAD_PHASE) == "sap":
+        pair_i, pair_j = _sweep_and_prune_pairs(mins, maxs)
+    else:
+        pair_i, pair_j = _query_candidate_pairs(scene_graph, mins, maxs)
     
-    for i in range(len(scene_graph.placements)):
-        placement_a = scene_graph.get_placement(i)
-        
-        # Get AABB for Broad Phase
-        (min_x, min_y, min_z), (max_x, max_y, max_z) = get_world_aabb(placement_a)
-        
+    # Narrow phase over all candidates at once (numba prange or threaded NumPy)
+    hits = collide_pairs(mins, maxs, pair_i, pair_j, SHRUNK_OVERLAP_MIN)
+    return list(zip(pair_i[hits].tolist(), pair_j[hits].tolist()))
+
+def _query_candidate_pairs(scene_graph: SceneGraph, mins: np.ndarray, maxs: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Broad phase: use the scene graph's spatial index to find potentially overlapping pairs.
+    Returns parallel index arrays (i, j) with i < j.
+    """
+    pair_i: List[int] = []
+    pair_j: List[int] = []
+    
+    for i in range(len(mins)):
         # Query potential colliders
-        # We shrink the query box slightly to avoid false positives from adjacent touching bricks?
-        # Actually, if we use exact AABB, R-tree returns anything that touches or overlaps.
+        # If we use exact AABB, the index returns anything that touches or overlaps.
         # We'll filter in narrow phase.
-        candidates = scene_graph.query_box((min_x, min_y, min_z), (max_x, max_y, max_z))
+        candidates = scene_graph.query_box(tuple(mins[i]), tuple(maxs[i]))
         
+        # AABB intersection is symmetric, so each pair shows up from both sides.
+        # Keeping only j > i avoids duplicate reports (A vs B and B vs A).
         for j in candidates:
-            if i == j:
-                continue
-                
-            # Sort IDs to ensure consistent pair ordering
-            pair = tuple(sorted((i, j)))
-            if pair in processed_pairs:
-                continue
-            
-            processed_pairs.add(pair)
-            placement_b = scene_graph.get_placement(j)
-            
-            if _check_narrow_phase(placement_a, placement_b):
-                collisions.append((i, j))
-                
-    return collisions
+            if j > i:
+                pair_i.append(i)
+                pair_j.append(j)
+    
+    return np.array(pair_i, dtype=np.intp), np.array(pair_j, dtype=np.intp)
 
-def _check_narrow_phase(p1, p2) -> bool:
+def _sweep_and_prune_pairs(mins: np.ndarray, maxs: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
     """
-    Detailed intersection test.
-    Returns True if valid collision (volume intersection), False otherwise.
+    Broad phase: sort-and-sweep along X, then filter the X-overlapping pairs by Y and Z.
+    Returns parallel index arrays (i, j) with i < j.
     """
+    n = len(mins)
+    order = np.argsort(mins[:, 0], kind="stable")
+    sorted_min_x = mins[order, 0]
     
-    # 1. Exact AABB Overlap Calculation
-    (min1, max1) = get_world_aabb(p1)
-    (min2, max2) = get_world_aabb(p2)
+    # Box k (in sorted order) overlaps every later box whose min_x <= its max_x.
+    # searchsorted gives where that run ends, so the sweep needs no active list.
+    run_end = np.searchsorted(sorted_min_x, maxs[order, 0], side="right")
+    counts = np.maximum(run_end - np.arange(n) - 1, 0)
     
-    overlap_x = min(max1[0], max2[0]) - max(min1[0], min2[0])
-    overlap_y = min(max1[1], max2[1]) - max(min1[1], min2[1])
-    overlap_z = min(max1[2], max2[2]) - max(min1[2], min2[2])
+    first = np.repeat(np.arange(n), counts)
+    run_start = np.repeat(np.cumsum(counts) - counts, counts)
+    second = first + 1 + (np.arange(counts.sum()) - run_start)
     
-    # If any dimension has no overlap (<= some epsilon), then no collision
-    # Using a small epsilon to allow touching faces
-    epsilon = 0.05 
+    a = order[first]
+    b = order[second]
     
-    if overlap_x < epsilon or overlap_y < epsilon or overlap_z < epsilon:
-        return False
-        
-    # 2. Stud/Anti-stud handling (Heuristic)
-    # If the intersection is primarily vertical and they are stacked, we might allow it.
-    # But strictly speaking, bricks shouldn't intersect unless it's the stud vs hole.
-    # Logic: 
-    #   - If Y-overlap is small (stud height approx 4 LDU), and X/Z overlap matches connection...
-    #   - For POC, we'll just stick to AABB. If AABB overlaps significantly, it's a collision.
-    #   - BUT, standard bricks stacked will have touching faces (overlap = 0 or close).
-    #   - Studs go INTO the clean AABB of the brick above? 
-    #   - Usually LDraw primitives for "Brick" include the studs on top.
-    #   - The generic bounding box usually INCLUDES studs.
-    #   - So if Brick A is on top of Brick B, Brick B's studs stick INTO Brick A's bottom.
-    #   - This means their AABBs WILL intersect.
-    
-    # Workaround for POC Week 4:
-    # We define a "Collision Box" that is slightly smaller than the visual BBox.
-    # Specifically, we might ignore the top 4 LDU (stud height) of the bottom brick
-    # or the bottom 4 LDU of the top brick?
-    # Better: Shrink the AABB by a margin (e.g. 1 LDU) on all sides for the purpose of "Solid" collision.
-    # This avoids "touching" false positives and might bypass the stud overlap if it's just studs.
-    
-    # Refined Check with Shrink
-    shrink_amount = 2.0 # LDU. Studs are usually ~4 LDU high.
-    
-    s_min1 = (min1[0]+shrink_amount, min1[1]+shrink_amount, min1[2]+shrink_amount)
-    s_max1 = (max1[0]-shrink_amount, max1[1]-shrink_amount, max1[2]-shrink_amount)
+    # Same inclusive test query_box uses, on the remaining two axes
+    yz_hit = ((mins[a, 1:] <= maxs[b, 1:]) & (mins[b, 1:] <= maxs[a, 1:])).all(axis=1)
+    a, b = a[yz_hit], b[yz_hit]
     
-    s_min2 = (min2[0]+shrink_amount, min2[1]+shrink_amount, min2[2]+shrink_amount)
-    s_max2 = (max2[0]-shrink_amount, max2[1]-shrink_amount, max2[2]-shrink_amount)
-    
-    # Check if SHRUNKEN boxes intersect
-    s_overlap_x = min(s_max1[0], s_max2[0]) - max(s_min1[0], s_min2[0])
-    s_overlap_y = min(s_max1[1], s_max2[1]) - max(s_min1[1], s_min2[1])
-    s_overlap_z = min(s_max1[2], s_max2[2]) - max(s_min1[2], s_min2[2])
+    pair_i = np.minimum(a, b)
+    pair_j = np.maximum(a, b)
+    ranking = np.lexsort((pair_j, pair_i))
+    return pair_i[ranking], pair_j[ranking]
+
+def _check_narrow_phase(p1, p2) -> bool:
+    """
+    Detailed intersection test.
+    Returns True if valid collision (volume intersection), False otherwise.
+    """
+    (min1, max1) = get_world_aabb(p1)
+    (min2, max2) = get_world_aabb(p2)
     
-    if s_overlap_x > 0 and s_overlap_y > 0 and s_overlap_z > 0:
-        return True
-        
-    return False
+    # Stacked bricks have touching faces, and the studs of the lower brick
+    # poke into the visual AABB of the one above (the bbox includes studs).
+    # So we treat each part as a "Collision Box" shrunk by SHRINK_AMOUNT on
+    # all sides and only report a collision if the shrunken boxes intersect.
+    #
+    # The shrunken overlap is the exact overlap minus 2 * SHRINK_AMOUNT, so
+    # one comparison per axis covers both this and the touching-faces test
+    # (anything passing it overlaps by far more than TOUCH_EPSILON).
+    return (
+        min(max1[0], max2[0]) - max(min1[0], min2[0]) > SHRUNK_OVERLAP_MIN
+        and min(max1[1], max2[1]) - max(min1[1], min2[1]) > SHRUNK_OVERLAP_MIN
+        and min(max1[2], max2[2]) - max(min1[2], min2[2]) > SHRUNK_OVERLAP_MIN
+    )
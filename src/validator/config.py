@@ -4,6 +4,9 @@ import os
 # Default to C:\LDraw\ldraw if not specified
 LDRAW_PATH = Path(os.environ.get("LDRAW_PATH", r"C:\LDraw\ldraw"))
 
+# Collision broad phase: "index" (scene graph spatial index) or "sap" (sort-and-sweep)
+COLLISION_BROAD_PHASE = os.environ.get("COLLISION_BROAD_PHASE", "index")
+
 def get_parts_dir() -> Path:
     return LDRAW_PATH / "parts"
 
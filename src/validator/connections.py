@@ -1,8 +1,10 @@
 from typing import List, Tuple, Set, Any, Dict
 import math
+import numpy as np
+from scipy.spatial import cKDTree
 from validator.parser import Placement
-from validator.catalog_db import get_part, PartInfo
-from validator.geometry import transform_point
+from validator.catalog_db import get_parts, PartInfo, GENDER_CODES
+from validator.geometry import transform_points
 
 def get_world_connection_points(placement: Placement, info: PartInfo) -> List[Dict[str, Any]]:
     """
@@ -11,16 +13,16 @@ def get_world_connection_points(placement: Placement, info: PartInfo) -> List[Di
     if not info or not info.connection_points:
         return []
     
+    # One batched transform for all of the part's points
+    world = transform_points(info.connection_point_array, placement).tolist()
+    
     world_points = []
-    for cp in info.connection_points:
+    for cp, world_pos in zip(info.connection_points, world):
         # cp is a dict with 'pos', 'ori', 'type', 'gender', etc.
-        local_pos = tuple(cp['pos'])
-        world_pos = transform_point(local_pos, placement)
-        
         # TODO: Transform orientation as well if we want strict vector matching
         # For now, we store world position and metadata
         wp = cp.copy()
-        wp['world_pos'] = world_pos
+        wp['world_pos'] = tuple(world_pos)
         world_points.append(wp)
         
     return world_points
@@ -67,59 +69,58 @@ def check_explicit_connection(
     
     return True
 
-def build_connection_graph(scene_graph: Any) -> List[Tuple[int, int]]:
+def build_connection_graph(scene_graph: Any, tolerance: float = 0.5) -> List[Tuple[int, int]]:
     """
     Build an adjacency list of connections using explicit shadow library data.
+    
+    Connection points are bucketed by type; within each type one KD-tree
+    over the male points is queried against one over the female points,
+    so incompatible pairs (same gender, different type) are never
+    compared at all.
     """
-    connections = set()
-    num_parts = len(scene_graph.placements)
+    positions = []
+    owners = []
+    genders = []
+    type_codes = []
     
-    # Pre-calculate world points for all parts to avoid re-transforming
-    # Map: index -> list of world connection points
-    part_connections = {}
+    infos = get_parts(p.part_id for p in scene_graph.placements)
     
-    for i in range(num_parts):
-        p = scene_graph.get_placement(i)
-        info = get_part(p.part_id)
-        if info:
-            part_connections[i] = get_world_connection_points(p, info)
-        else:
-            part_connections[i] = []
-
-    # Iterate
-    for i in range(num_parts):
-        points_a = part_connections[i]
-        if not points_a:
+    for i, p in enumerate(scene_graph.placements):
+        info = infos[p.part_id]
+        if not info or not info.connection_points:
             continue
-            
-        # We can still use the spatial query for optimization
-        # Collect all points of A
-        # Query neighbors for each point
-        
-        for cp_a in points_a:
-            w_pos = cp_a['world_pos']
-            neighbors = scene_graph.query_point(w_pos, tolerance=1.0)
-            # print(f"Point A {cp_a['type']} {cp_a['gender']} at {w_pos} -> Neighbors: {neighbors}")
-            
-            for j in neighbors:
-                if i == j: continue
-                # We interpret (i, j) as a potential connection
-                # Check explicit compatibility against ALL points of B
-                # (Optimization: spatial query returns parts close to w_pos, 
-                # but we need to find the specific connection point on B that is close)
-                
-                points_b = part_connections[j]
-                
-                # Scan B's points for a match
-                # This is O(N_points_A * N_points_B) locally, which is fine (usually < 100 points)
-                for cp_b in points_b:
-                    if check_explicit_connection(cp_a, cp_b):
-                        connections.add(tuple(sorted((i, j))))
-                        # Optimization: one connection enough to link graph nodes?
-                        # Yes, unless we want to count strength.
-                        break
-                else:
-                    continue # Continue inner loop if no break
-                break # Break outer loop (neighbors) if connection found to j
-                
-    return list(connections)
+        positions.append(transform_points(info.connection_point_array, p))
+        owners.append(np.full(len(info.connection_points), i, dtype=np.intp))
+        genders.append(info.connection_genders)
+        type_codes.append(info.connection_type_codes)
+    
+    if not positions:
+        return []
+    
+    all_pts = np.concatenate(positions)
+    owner = np.concatenate(owners)
+    gender = np.concatenate(genders)
+    type_code = np.concatenate(type_codes)
+    
+    is_male = gender == GENDER_CODES['M']
+    is_female = gender == GENDER_CODES['F']
+    edge_blocks = []
+    
+    for t in np.unique(type_code):
+        male = np.flatnonzero(is_male & (type_code == t))
+        female = np.flatnonzero(is_female & (type_code == t))
+        if not len(male) or not len(female):
+            continue
+        # Every (male, female) pair with distance <= tolerance
+        close = cKDTree(all_pts[male], leafsize=16).sparse_distance_matrix(
+            cKDTree(all_pts[female], leafsize=16), tolerance, output_type='ndarray')
+        i, j = owner[male[close['i']]], owner[female[close['j']]]
+        other = i != j
+        edge_blocks.append(np.stack([np.minimum(i, j), np.maximum(i, j)], axis=1)[other])
+    
+    if not edge_blocks:
+        return []
+    
+    # One edge per part pair, however many points snap together
+    edges = np.unique(np.concatenate(edge_blocks), axis=0)
+    return [tuple(e) for e in edges.tolist()]
@@ -1,5 +1,8 @@
 from typing import Tuple, List, Dict, Any, Optional
+import numpy as np
 from validator.parser import Placement
+from validator.catalog_db import get_part
+from validator.geometry_kernels import world_aabb
 
 def multiply_matrix(m1: tuple[float, ...], m2: tuple[float, ...]) -> tuple[float, ...]:
     """
@@ -51,43 +54,45 @@ def transform_point(point: Tuple[float, float, float], placement: Placement) ->
 
 
 # ... (keep existing check_collision etc) ...
-def get_world_studs(placement: Placement, part_info: Any) -> List[Tuple[float, float, float]]:
-    return [transform_point(s, placement) for s in part_info.studs]
+def transform_points(points: np.ndarray, placement: Placement) -> np.ndarray:
+    """
+    Vectorized transform_point over a (K, 3) array.
+    Returns a (K, 3) float32 array.
+    """
+    return points @ placement.rotation_matrix.T + np.asarray(placement.position, dtype=np.float32)
+
+def get_world_studs(placement: Placement, part_info: Any) -> np.ndarray:
+    return transform_points(part_info.stud_array, placement)
 
-def get_world_antistuds(placement: Placement, part_info: Any) -> List[Tuple[float, float, float]]:
-    return [transform_point(s, placement) for s in (part_info.anti_studs or [])]
+def get_world_antistuds(placement: Placement, part_info: Any) -> np.ndarray:
+    return transform_points(part_info.anti_stud_array, placement)
 
 def get_world_aabb(placement: Placement) -> Tuple[Tuple[float, float, float], Tuple[float, float, float]]:
-    # Avoid circular import if possible, but for AABB we need catalog info.
-    # Assuming the caller has access or we pass info separately.
-    # Because 'from validator.catalog_db import get_part' was at top level, it might cycle.
-    # Moving import inside if needed.
-    from validator.catalog_db import get_part
-    info = get_part(placement.part_id)
-    bx = info.bounds['x']
-    by = info.bounds['y']
-    bz = info.bounds['z']
+    """
+    World-space AABB of a placement, from its part's bounds.
+    Computed once per placement and cached on it.
+    """
+    if placement._aabb is not None:
+        return placement._aabb
     
-    corners = []
-    for x in bx:
-        for y in by:
-            for z in bz:
-                corners.append(transform_point((x, y, z), placement))
-                
-    min_x = min(c[0] for c in corners)
-    min_y = min(c[1] for c in corners)
-    min_z = min(c[2] for c in corners)
-    max_x = max(c[0] for c in corners)
-    max_y = max(c[1] for c in corners)
-    max_z = max(c[2] for c in corners)
+    info = get_part(placement.part_id)
+    if info.corners is None:
+        raise KeyError(f"Part {placement.part_id} has no bounds")
     
-    return (min_x, min_y, min_z), (max_x, max_y, max_z)
+    placement._aabb = world_aabb(info.corners, placement.rotation_matrix, placement.position)
+    return placement._aabb
 
 def check_collision(p1: Placement, p2: Placement, tolerance: float = 0.5) -> bool:
+    """
+    True if the two AABBs overlap by more than tolerance on every axis.
+    In center/half-extent form this is one compare per axis,
+    |c1 - c2| < h1 + h2 - tolerance, done here on doubled values
+    (sums and differences of the bounds) to avoid halving.
+    """
     min1, max1 = get_world_aabb(p1)
     min2, max2 = get_world_aabb(p2)
     
-    for i in range(3):
-        if max1[i] <= min2[i] + tolerance or min1[i] >= max2[i] - tolerance:
-            return False
-    return True
+    return all(
+        abs((hi1 + lo1) - (hi2 + lo2)) < (hi1 - lo1) + (hi2 - lo2) - 2 * tolerance
+        for lo1, hi1, lo2, hi2 in zip(min1, max1, min2, max2)
+    )
@@ -0,0 +1,126 @@
+"""
+Compiled kernels for the hot geometry loops.
+
+Numba is optional. When it is installed the kernels are compiled with
+parallel=True and run over prange; otherwise the same entry points fall
+back to NumPy, sharded across a thread pool (NumPy releases the GIL on
+large array operations).
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+try:
+    from numba import njit, prange
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+# Below this many pairs, thread start-up costs more than it saves
+PARALLEL_MIN_PAIRS = 4096
+
+def collide_pairs(mins: np.ndarray, maxs: np.ndarray, pair_i: np.ndarray, pair_j: np.ndarray, min_overlap: float) -> np.ndarray:
+    """
+    For each candidate pair (pair_i[k], pair_j[k]) of (N, 3) AABBs, test
+    whether the boxes overlap by more than min_overlap on every axis.
+    Returns a boolean mask of length K.
+    """
+    out = np.empty(len(pair_i), dtype=np.bool_)
+    if not len(out):
+        return out
+
+    if HAVE_NUMBA:
+        _collide_pairs_kernel(mins, maxs, pair_i, pair_j, min_overlap, out)
+    elif len(out) < PARALLEL_MIN_PAIRS:
+        _collide_pairs_numpy(mins, maxs, pair_i, pair_j, min_overlap, out)
+    else:
+        _run_sharded(_collide_pairs_numpy, len(out), mins, maxs, pair_i, pair_j, min_overlap, out)
+    return out
+
+def _collide_pairs_numpy(mins, maxs, pair_i, pair_j, min_overlap, out) -> None:
+    overlap = np.minimum(maxs[pair_i], maxs[pair_j]) - np.maximum(mins[pair_i], mins[pair_j])
+    out[:] = (overlap > min_overlap).all(axis=1)
+
+def _run_sharded(fn, n: int, *args) -> None:
+    """
+    Call fn on contiguous shards of [0, n) in a thread pool.
+    Kernels take (shared..., pair_i, pair_j, scalar, out); only the pair
+    arrays and out are sliced per shard.
+    """
+    *shared, pair_i, pair_j, scalar, out = args
+    workers = min(os.cpu_count() or 1, max(1, n // PARALLEL_MIN_PAIRS))
+    bounds = np.linspace(0, n, workers + 1).astype(np.intp)
+
+    def shard(k: int) -> None:
+        lo, hi = bounds[k], bounds[k + 1]
+        fn(*shared, pair_i[lo:hi], pair_j[lo:hi], scalar, out[lo:hi])
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(shard, range(workers)))
+
+def world_aabb(corners: np.ndarray, rotation: np.ndarray, position) -> tuple:
+    """
+    World-space AABB of (K, 3) local corners under a 3x3 rotation and a
+    position. Returns (min_xyz, max_xyz) tuples.
+    A single 8-corner box is far too small for NumPy's per-call overhead,
+    so this goes through the compiled kernel when numba is available.
+    """
+    px, py, pz = position
+    if HAVE_NUMBA:
+        return _world_aabb_kernel(corners, rotation, float(px), float(py), float(pz))
+    world = corners @ rotation.T + np.asarray(position, dtype=np.float32)
+    return tuple(world.min(axis=0).tolist()), tuple(world.max(axis=0).tolist())
+
+def apply_transform(pos: np.ndarray, rotation: np.ndarray, offset: np.ndarray) -> np.ndarray:
+    """
+    pos @ rotation.T + offset for (K, 3) float64 points, a 3x3 rotation
+    and a 3-vector offset. Returns a new (K, 3) array.
+    """
+    if HAVE_NUMBA:
+        return _apply_transform_kernel(pos, rotation, offset)
+    return pos @ rotation.T + offset
+
+if HAVE_NUMBA:
+    @njit(parallel=True, cache=True)
+    def _collide_pairs_kernel(mins, maxs, pair_i, pair_j, min_overlap, out):
+        for k in prange(len(pair_i)):
+            i = pair_i[k]
+            j = pair_j[k]
+            hit = True
+            for d in range(3):
+                if min(maxs[i, d], maxs[j, d]) - max(mins[i, d], mins[j, d]) <= min_overlap:
+                    hit = False
+                    break
+            out[k] = hit
+
+    @njit(cache=True)
+    def _world_aabb_kernel(corners, rot, px, py, pz):
+        lo_x = lo_y = lo_z = np.inf
+        hi_x = hi_y = hi_z = -np.inf
+        for k in range(corners.shape[0]):
+            x = corners[k, 0]
+            y = corners[k, 1]
+            z = corners[k, 2]
+            wx = rot[0, 0]*x + rot[0, 1]*y + rot[0, 2]*z + px
+            wy = rot[1, 0]*x + rot[1, 1]*y + rot[1, 2]*z + py
+            wz = rot[2, 0]*x + rot[2, 1]*y + rot[2, 2]*z + pz
+            lo_x = min(lo_x, wx)
+            lo_y = min(lo_y, wy)
+            lo_z = min(lo_z, wz)
+            hi_x = max(hi_x, wx)
+            hi_y = max(hi_y, wy)
+            hi_z = max(hi_z, wz)
+        return (lo_x, lo_y, lo_z), (hi_x, hi_y, hi_z)
+
+    @njit(cache=True, fastmath=True)
+    def _apply_transform_kernel(pos, rot, t):
+        out = np.empty_like(pos)
+        for i in range(pos.shape[0]):
+            x = pos[i, 0]
+            y = pos[i, 1]
+            z = pos[i, 2]
+            out[i, 0] = rot[0, 0]*x + rot[0, 1]*y + rot[0, 2]*z + t[0]
+            out[i, 1] = rot[1, 0]*x + rot[1, 1]*y + rot[1, 2]*z + t[1]
+            out[i, 2] = rot[2, 0]*x + rot[2, 1]*y + rot[2, 2]*z + t[2]
+        return out
@@ -1,4 +1,8 @@
-from typing import List, Tuple, Set
+from typing import List, Tuple
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+from validator.catalog_db import get_parts
 from validator.geometry import get_world_aabb
 from validator.parser import Placement
 
@@ -18,6 +22,36 @@ def is_touching_ground(
     # Ground is always at Y=0 in this model.
     return abs(bottom_y - ground_y) < tolerance
 
+def ground_contact_mask(
+    placements: List[Placement],
+    ground_y: float = 0,
+    tolerance: float = 0.5
+) -> np.ndarray:
+    """
+    Vectorized is_touching_ground over all placements.
+    Returns a boolean array, True where the part's bottom rests on ground_y.
+    """
+    infos = get_parts(p.part_id for p in placements)
+    part_ids = list(infos)
+    corner_bank = []
+    for part_id, info in infos.items():
+        if info.corners is None:
+            raise KeyError(f"Part {part_id} has no bounds")
+        corner_bank.append(info.corners)
+    corner_bank = np.stack(corner_bank)
+    
+    slot = {part_id: k for k, part_id in enumerate(part_ids)}
+    part_idx = np.array([slot[p.part_id] for p in placements], dtype=np.intp)
+    
+    # Only world Y is needed: y = R[1, :] . corner + t_y, for all 8 corners at once
+    rot_y = np.stack([p.rotation_matrix[1] for p in placements])
+    pos_y = np.array([p.position[1] for p in placements], dtype=np.float32)
+    world_y = np.einsum('pj,pkj->pk', rot_y, corner_bank[part_idx]) + pos_y[:, None]
+    
+    # Bottom of the part is its max Y (LDraw Y points down)
+    bottom_y = world_y.max(axis=1)
+    return np.abs(bottom_y - ground_y) < tolerance
+
 def validate_grounding(
     placements: List[Placement],
     connections: List[Tuple[int, int]]
@@ -30,36 +64,16 @@ def validate_grounding(
     if num_parts == 0:
         return True, []
 
-    # Build adjacency list
-    adj: List[List[int]] = [[] for _ in range(num_parts)]
-    for u, v in connections:
-        adj[u].append(v)
-        adj[v].append(u)
-
-    # Find parts touching ground directly
-    grounded: Set[int] = set()
-    queue: List[int] = []
+    # Label connected groups of parts; a group is grounded if any member
+    # touches the ground.
+    if connections:
+        rows, cols = np.array(connections, dtype=np.intp).T
+    else:
+        rows = cols = np.empty(0, dtype=np.intp)
+    graph = coo_matrix((np.ones(len(rows), dtype=np.int8), (rows, cols)), shape=(num_parts, num_parts))
+    _, labels = connected_components(graph, directed=False)
+    
+    grounded_labels = np.unique(labels[ground_contact_mask(placements)])
+    floating = np.flatnonzero(~np.isin(labels, grounded_labels)).tolist()
     
-    for i, p in enumerate(placements):
-        if is_touching_ground(p):
-            grounded.add(i)
-            queue.append(i)
-            
-    # BFS
-    idx = 0
-    while idx < len(queue):
-        u = queue[idx]
-        idx += 1
-        
-        for v in adj[u]:
-            if v not in grounded:
-                grounded.add(v)
-                queue.append(v)
-                
-    # Check if all parts are grounded
-    floating = []
-    for i in range(num_parts):
-        if i not in grounded:
-            floating.append(i)
-            
     return len(floating) == 0, floating
\ No newline at end of file
@@ -1,19 +1,23 @@
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
+import numpy as np
 from validator.scene_graph import SceneGraph
 from validator.parser import parse_mpd, Model, Placement
-from validator.geometry import multiply_matrix, transform_point_by_matrix
 
 class Loader:
     def __init__(self, scene_graph: SceneGraph):
         self.sg = scene_graph
         self.models: Dict[str, Model] = {}
+        self._local_cache: Dict[str, Tuple[np.ndarray, np.ndarray, List[Optional[Model]]]] = {}
+        self._flat_cache: Dict[str, Tuple[np.ndarray, np.ndarray, List[Placement]]] = {}
 
     def load(self, file_path: Path):
         """
         Load an LDraw file (single or MPD) into the scene graph.
         """
         self.models = parse_mpd(file_path)
+        self._local_cache = {}
+        self._flat_cache = {}
         
         # Identify main model
         # 1. First model in the dict?
@@ -27,53 +31,114 @@ class Loader:
         
         print(f"[INFO] Loading main model: {main_model_name}")
         self._instantiate_model(main_model)
+        
+        # Bake world-space stud geometry once the scene is complete
+        self.sg.finalize()
 
-    def _instantiate_model(
-        self, 
-        model: Model, 
-        parent_pos: tuple[float, float, float] = (0, 0, 0),
-        parent_rot: tuple[float, ...] = (1, 0, 0, 0, 1, 0, 0, 0, 1)
-    ):
-        for place in model.placements:
-            # Check if this placement refers to another internal model
-            # LDraw names are case insensitive usually, parser lowercased them.
-            # Filenames might have extension or not.
-            
+    def _instantiate_model(self, model: Model):
+        """
+        Flatten the model tree into the scene graph.
+        Leaf parts are added in file (depth-first) order.
+        """
+        self._check_acyclic(model)
+        world_rot, world_pos, leaves = self._flatten(model)
+        rotation_pool: Dict[tuple, tuple] = {}
+        
+        for place, pos, rot in zip(leaves, world_pos.tolist(), world_rot.reshape(-1, 9).tolist()):
+            rot = tuple(rot)
+            # It's a leaf part (library brick)
+            # Note: SceneGraph stores Placements. We are storing a "Flattened" placement here.
+            flat_placement = Placement(
+                part_id=place.part_id,
+                color=place.color,
+                position=tuple(pos),
+                rotation=rotation_pool.setdefault(rot, rot)
+            )
+            self.sg.add_placement(flat_placement)
+
+    def _flatten(self, model: Model) -> Tuple[np.ndarray, np.ndarray, List[Placement]]:
+        """
+        All leaf parts of a model, relative to the model's own origin:
+        (L, 3, 3) rotations, (L, 3) positions and the leaf placements.
+        
+        Computed once per model and cached, so a sub-model instanced many
+        times is only walked once; each instance then costs one batched
+        transform of the cached leaves:
+            World_Rot = Place_Rot * Leaf_Rot
+            World_Pos = Place_Pos + (Place_Rot * Leaf_Pos)
+        """
+        cached = self._flat_cache.get(model.name)
+        if cached is not None:
+            return cached
+        
+        local_rot, local_pos, subs = self._local_transforms(model)
+        rot_blocks, pos_blocks = [], []
+        leaves: List[Placement] = []
+        
+        def take_parts(start: int, stop: int):
+            # Consecutive library parts are copied as one slice
+            if start < stop:
+                rot_blocks.append(local_rot[start:stop])
+                pos_blocks.append(local_pos[start:stop])
+                leaves.extend(model.placements[start:stop])
+        
+        run_start = 0
+        for k, sub_model in enumerate(subs):
+            if sub_model is None:
+                continue
+            take_parts(run_start, k)
+            sub_rot, sub_pos, sub_leaves = self._flatten(sub_model)
+            rot_blocks.append(local_rot[k] @ sub_rot)
+            pos_blocks.append(sub_pos @ local_rot[k].T + local_pos[k])
+            leaves.extend(sub_leaves)
+            run_start = k + 1
+        take_parts(run_start, len(subs))
+        
+        if rot_blocks:
+            cached = (np.concatenate(rot_blocks), np.concatenate(pos_blocks), leaves)
+        else:
+            cached = (np.empty((0, 3, 3)), np.empty((0, 3)), leaves)
+        self._flat_cache[model.name] = cached
+        return cached
+
+    def _check_acyclic(self, model: Model):
+        """Raise ValueError if a sub-model (directly or indirectly) includes itself."""
+        in_progress = {model.name}
+        done = set()
+        stack = [(model, iter(self._local_transforms(model)[2]))]
+        while stack:
+            current, subs = stack[-1]
+            for sub in subs:
+                if sub is None or sub.name in done:
+                    continue
+                if sub.name in in_progress:
+                    raise ValueError(f"Sub-model '{sub.name}' includes itself")
+                in_progress.add(sub.name)
+                stack.append((sub, iter(self._local_transforms(sub)[2])))
+                break
+            else:
+                stack.pop()
+                in_progress.discard(current.name)
+                done.add(current.name)
+
+    def _local_transforms(self, model: Model) -> Tuple[np.ndarray, np.ndarray, List[Optional[Model]]]:
+        """
+        (k, 3, 3) rotations, (k, 3) positions and resolved sub-models
+        (None for library parts) of a model's placements, cached per model.
+        """
+        cached = self._local_cache.get(model.name)
+        if cached is None:
             # Sub-model resolution logic:
             # 1. Exact match
             # 2. Match with .ldr appened
             # 3. Match with .dat appended
-            
-            sub_id = place.part_id.lower()
-            sub_model = self._resolve_submodel(sub_id)
-            
-            # Calculate world transform for this placement
-            # World_Rot = Parent_Rot * Place_Rot
-            world_rot = multiply_matrix(parent_rot, place.rotation)
-            
-            # World_Pos = Parent_Pos + (Parent_Rot * Place_Pos)
-            rotated_offset = transform_point_by_matrix(place.position, parent_rot)
-            world_pos = (
-                parent_pos[0] + rotated_offset[0],
-                parent_pos[1] + rotated_offset[1],
-                parent_pos[2] + rotated_offset[2]
-            )
-            
-            if sub_model:
-                # Recurse
-                self._instantiate_model(sub_model, world_pos, world_rot)
-            else:
-                # It's a leaf part (library brick)
-                # Add to Scene Graph with resolved world coordinates
-                
-                # Note: SceneGraph stores Placements. We are storing a "Flattened" placement here.
-                flat_placement = Placement(
-                    part_id=place.part_id,
-                    color=place.color,
-                    position=world_pos,
-                    rotation=world_rot
-                )
-                self.sg.add_placement(flat_placement)
+            # LDraw names are case insensitive usually, parser lowercased them.
+            subs = [self._resolve_submodel(place.part_id.lower()) for place in model.placements]
+            rots = np.array([place.rotation for place in model.placements], dtype=np.float64).reshape(-1, 3, 3)
+            pos = np.array([place.position for place in model.placements], dtype=np.float64).reshape(-1, 3)
+            cached = (rots, pos, subs)
+            self._local_cache[model.name] = cached
+        return cached
 
     def _resolve_submodel(self, name: str) -> Optional[Model]:
         # Try exact
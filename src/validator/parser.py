@@ -1,9 +1,14 @@
+import mmap
+import os
+import re
+import sys
 from pathlib import Path
 from dataclasses import dataclass, field
 from typing import Iterator, Optional
+import numpy as np
 
 
-@dataclass
+@dataclass(slots=True)
 class LDrawCommand:
     line_type: int
     color: int = 0
@@ -13,12 +18,23 @@ class LDrawCommand:
     # For line type 0 (comment), 2 (line), 3 (triangle), 4 (quad), 5 (optional line)
     params: list[str] = field(default_factory=list)
 
-@dataclass
+# Slotted: a large MOC creates tens of thousands of these
+@dataclass(slots=True)
 class Placement:
     part_id: str
     color: int
     position: tuple[float, float, float]
     rotation: tuple[float, ...]
+    _rotation_matrix: Optional[np.ndarray] = field(default=None, init=False, repr=False, compare=False)
+    # World AABB, filled in by geometry.get_world_aabb
+    _aabb: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def rotation_matrix(self) -> np.ndarray:
+        """rotation as a (3, 3) float32 array, built on first use."""
+        if self._rotation_matrix is None:
+            self._rotation_matrix = np.asarray(self.rotation, dtype=np.float32).reshape(3, 3)
+        return self._rotation_matrix
 
 def parse_line(line: str) -> Optional[LDrawCommand]:
     parts = line.strip().split()
@@ -48,47 +64,89 @@ class Model:
     name: str
     placements: list[Placement] = field(default_factory=list)
 
+# "0 FILE <name>" / "0 NOFILE" meta lines, which delimit models in an MPD
+_FILE_MARKER = re.compile(rb'^[ \t]*0[ \t]+(FILE|NOFILE)\b(.*)$', re.M)
+
+def _read_bytes(file_path: Path) -> bytes:
+    """Whole file as raw bytes, read through mmap (no decoding or newline translation)."""
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""  # mmap cannot map an empty file
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return mm[:]
+
+def _decode(raw: bytes) -> str:
+    # Names are the only text we keep; collapse runs of whitespace
+    return " ".join(raw.decode('utf-8', errors='replace').split())
+
 def parse_mpd(file_path: Path) -> dict[str, Model]:
     """
     Parse an MPD file (or single LDraw file) and return all models contained within.
+    
+    One regex pass finds the FILE markers (each model runs from its marker
+    to the next one); the numeric columns of all type 1 lines (color,
+    position, rotation) are then converted in a single np.loadtxt call.
+    The file is scanned as bytes; only model and sub-file names are decoded.
     """
+    text = _read_bytes(file_path)
+    
     models: dict[str, Model] = {}
-    current_model = Model(name="main", placements=[])
-    # For non-MPD files, we treat everything as one "main" model.
-    is_mpd = False
+    spans: list[tuple[Model, int, int]] = []
     
-    with open(file_path, 'r') as f:
-        for line in f:
-            cmd = parse_line(line)
-            if not cmd:
+    markers = [m for m in _FILE_MARKER.finditer(text) if m.group(1) == b"FILE"]
+    if markers:
+        # NOFILE is a no-op, as before: lines after it stay with the current model
+        for k, m in enumerate(markers):
+            model_name = _decode(m.group(2)).lower()
+            model = Model(name=model_name, placements=[])
+            models[model_name] = model
+            end = markers[k + 1].start() if k + 1 < len(markers) else len(text)
+            spans.append((model, m.end(), end))
+    else:
+        # For non-MPD files, we treat everything as one "main" model.
+        models["main"] = Model(name="main", placements=[])
+        spans.append((models["main"], 0, len(text)))
+    
+    # Type 1 lines, their sub-file names and the model each belongs to
+    ref_lines: list[bytes] = []
+    ref_files: list[str] = []
+    ref_models: list[Model] = []
+    
+    for model, start, end in spans:
+        for line in text[start:end].splitlines():
+            line = line.strip()
+            if line[:1] != b'1' or not line[1:2].isspace():
                 continue
+            # Type 1: Sub-file reference
+            parts = line.split(None, 14)
+            if len(parts) < 15:
+                continue
+            ref_lines.append(line)
+            ref_files.append(_decode(parts[14])) # filenames can have spaces
+            ref_models.append(model)
+    
+    if ref_lines:
+        # Columns 1-13: color, x y z, a b c d e f g h i (filename columns are skipped)
+        numbers = np.loadtxt(ref_lines, dtype=np.float64, usecols=range(1, 14), comments=None, ndmin=2)
+        colors = numbers[:, 0].astype(int).tolist()
+        positions = numbers[:, 1:4].tolist()
+        rotations = numbers[:, 4:13].tolist()
+        # Most placements share a handful of rotations; keep one tuple per distinct value
+        rotation_pool: dict[tuple, tuple] = {}
+        
+        for model, file, color, pos, rot in zip(ref_models, ref_files, colors, positions, rotations):
+            part_id = file.lower()
+            part_id = part_id.removesuffix('.dat').removesuffix('.ldr')
+            # Few distinct parts, many placements: share one string per part ID
+            part_id = sys.intern(part_id)
+            rot = tuple(rot)
             
-            if cmd.line_type == 0:
-                # Meta command
-                if cmd.params and cmd.params[0] == "FILE":
-                    is_mpd = True
-                    model_name = " ".join(cmd.params[1:]).lower()
-                    current_model = Model(name=model_name, placements=[])
-                    models[model_name] = current_model
-                elif cmd.params and cmd.params[0] == "NOFILE":
-                    # End of current file block
-                    pass
-            
-            elif cmd.line_type == 1:
-                # Type 1: Sub-file reference
-                part_id = cmd.file.lower()
-                part_id = part_id.removesuffix('.dat').removesuffix('.ldr')
-                
-                current_model.placements.append(Placement(
-                    part_id=part_id,
-                    color=cmd.color,
-                    position=cmd.pos,
-                    rotation=cmd.rot
-                ))
-
-    # If it wasn't an MPD file (no FILE commands), add the implicit main model
-    if not is_mpd and "main" not in models:
-        models["main"] = current_model
+            model.placements.append(Placement(
+                part_id=part_id,
+                color=color,
+                position=tuple(pos),
+                rotation=rotation_pool.setdefault(rot, rot)
+            ))
         
     return models
 
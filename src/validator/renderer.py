@@ -1,11 +1,15 @@
 import subprocess
 import os
+import shutil
 import tempfile
 from pathlib import Path
 from typing import Optional
 from validator.scene_graph import SceneGraph
 from validator.parser import Placement
 
+IDENTITY_ROTATION = (1.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 1.0)
+ORIGIN = (0.0, 0.0, 0.0)
+
 def render_scene(scene_graph: SceneGraph, output_path: str, width: int = 256, height: int = 256, silent_errors: bool = False) -> bool:
     """
     Render the scene graph to an image file using LDView.
@@ -20,25 +24,109 @@ def render_scene(scene_graph: SceneGraph, output_path: str, width: int = 256, he
     Returns:
         True if successful, False otherwise.
     """
+    return _render_placements(scene_graph.placements, output_path, width, height, silent_errors)
+
+
+def render_part(part_id: str, output_path: str, width: int = 256, height: int = 256,
+                silent_errors: bool = False, color: int = 16) -> bool:
+    """
+    Render a single part at the origin with identity rotation.
     
-    # 1. Export SceneGraph to a temporary LDraw file
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.ldr', delete=False) as tmp_file:
-        tmp_path = tmp_file.name
+    Same output as render_scene on a one-placement SceneGraph, without building
+    the scene graph (which looks the part up in the catalog for its AABB).
+    """
+    return _render_placements([Placement(part_id, color, ORIGIN, IDENTITY_ROTATION)],
+                              output_path, width, height, silent_errors)
+
+
+def render_single_part(part_id: str, output_path: str, width: int = 256, height: int = 256,
+                       silent_errors: bool = False) -> bool:
+    """
+    Render a single part by handing LDView its library .dat file directly.
+    
+    Same picture as render_part in the default color (16), without writing
+    a temporary model file. Falls back to render_part if the part is not
+    in the library's parts folder.
+    """
+    from validator.config import get_parts_dir
+    
+    part_file = get_parts_dir() / f"{part_id}.dat"
+    if not part_file.exists():
+        return render_part(part_id, output_path, width, height, silent_errors)
+    
+    ldview_cmd = _find_ldview(silent_errors)
+    if not ldview_cmd:
+        return False
+    return _snapshot(ldview_cmd, str(part_file), output_path, width, height, silent_errors)
+
+
+def render_parts(part_ids: list[str], output_dir: str, width: int = 256, height: int = 256,
+                 silent_errors: bool = False, color: int = 16) -> dict[str, bool]:
+    """
+    Render several single parts with one LDView process.
+    
+    Writes <output_dir>/<part_id>.png for each part, as render_part would,
+    but pays LDView's startup cost once (-SaveSnapshots batch mode).
+    
+    Returns:
+        Mapping of part_id to whether its image was written.
+    """
+    results = {part_id: False for part_id in part_ids}
+    if not results:
+        return results
+    ldview_cmd = _find_ldview(silent_errors)
+    if not ldview_cmd:
+        return results
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Numbered model files: part ids may contain path separators.
+        # LDView names each snapshot after its model file.
+        ldr_paths = []
+        for i, part_id in enumerate(results):
+            ldr_path = os.path.join(tmp_dir, f"{i}.ldr")
+            with open(ldr_path, 'w') as f:
+                f.write(_ldraw_text([Placement(part_id, color, ORIGIN, IDENTITY_ROTATION)]))
+            ldr_paths.append(ldr_path)
         
-        # Write header
-        tmp_file.write("0 MOC Render\n")
+        args = [ldview_cmd, *ldr_paths, *_ldview_options(width, height),
+                "-SaveSnapshots=1", f"-SaveDir={tmp_dir}", "-SaveExt=png"]
+        try:
+            subprocess.run(args, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        except subprocess.CalledProcessError as e:
+            # Some snapshots may still have been written; collect those below
+            if not silent_errors:
+                print(f"LDView failed: {e.stderr}")
+        except FileNotFoundError:
+            if not silent_errors:
+                print("LDView executable not found.")
+            return results
         
-        # Write placements
-        for placement in scene_graph.placements:
-            r = placement.rotation
-            pos = placement.position
-            part_id = placement.part_id.replace('/', '\\')
-            color = placement.color
-            
-            line = f"1 {color} {pos[0]} {pos[1]} {pos[2]} {r[0]} {r[1]} {r[2]} {r[3]} {r[4]} {r[5]} {r[6]} {r[7]} {r[8]} {part_id}.dat\n"
-            tmp_file.write(line)
-            
-    # 2. Find LDView
+        for i, part_id in enumerate(results):
+            snapshot = os.path.join(tmp_dir, f"{i}.png")
+            if os.path.exists(snapshot) and os.path.getsize(snapshot) > 0:
+                dest = os.path.join(output_dir, f"{part_id}.png")
+                os.makedirs(os.path.dirname(dest), exist_ok=True)  # e.g. 's/3001s01'
+                shutil.move(snapshot, dest)
+                results[part_id] = True
+    
+    return results
+
+
+def _ldraw_text(placements) -> str:
+    """LDraw model text: header plus one type 1 line per placement."""
+    lines = ["0 MOC Render\n"]
+    for placement in placements:
+        r = placement.rotation
+        pos = placement.position
+        part_id = placement.part_id.replace('/', '\\')
+        color = placement.color
+        
+        lines.append(f"1 {color} {pos[0]} {pos[1]} {pos[2]} {r[0]} {r[1]} {r[2]} {r[3]} {r[4]} {r[5]} {r[6]} {r[7]} {r[8]} {part_id}.dat\n")
+    return "".join(lines)
+
+
+def _find_ldview(silent_errors: bool) -> Optional[str]:
+    """Locate the LDView executable on PATH or in the usual install folders."""
     ldview_cmd = None
     
     possible_paths = [
@@ -48,7 +136,6 @@ def render_scene(scene_graph: SceneGraph, output_path: str, width: int = 256, he
         r"C:\LDView\LDView.exe"
     ]
     
-    import shutil
     if shutil.which("LDView64"):
         ldview_cmd = "LDView64"
     elif shutil.which("LDView"):
@@ -59,21 +146,19 @@ def render_scene(scene_graph: SceneGraph, output_path: str, width: int = 256, he
                 ldview_cmd = p
                 break
     
-    if not ldview_cmd:
-        if not silent_errors:
-            print("LDView executable not found.")
-        return False
-    
-    # 3. Build command args
+    if not ldview_cmd and not silent_errors:
+        print("LDView executable not found.")
+    return ldview_cmd
+
+
+def _ldview_options(width: int, height: int) -> list[str]:
+    """LDView settings shared by every snapshot (library, size, camera, lighting)."""
     from validator.config import LDRAW_PATH
     
-    args = [
-        ldview_cmd,
-        tmp_path,
+    return [
         f"-LDrawDir={LDRAW_PATH}",
         f"-SaveWidth={width}",
         f"-SaveHeight={height}",
-        f"-SaveSnapshot={output_path}",
         "-DefaultLatLong=30,45",
         "-BackgroundColor=0xFFFFFF",
         "-DefaultColor=0x7F7F7F",
@@ -89,21 +174,44 @@ def render_scene(scene_graph: SceneGraph, output_path: str, width: int = 256, he
         "-MemoryUsage=2",
         "-MaxAnisotropy=1",
     ]
+
+
+def _render_placements(placements, output_path: str, width: int, height: int, silent_errors: bool) -> bool:
+    """Write placements to a temporary LDraw file and snapshot it with LDView."""
+    
+    # 1. Export placements to a temporary LDraw file
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.ldr', delete=False) as tmp_file:
+        tmp_path = tmp_file.name
+        tmp_file.write(_ldraw_text(placements))
+    
+    # 2. Find LDView
+    ldview_cmd = _find_ldview(silent_errors)
+    if not ldview_cmd:
+        os.unlink(tmp_path)
+        return False
     
+    # 3. Snapshot it
     try:
-        result = subprocess.run(args, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-        success = True
+        return _snapshot(ldview_cmd, tmp_path, output_path, width, height, silent_errors)
+    finally:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+
+def _snapshot(ldview_cmd: str, model_path: str, output_path: str, width: int, height: int,
+              silent_errors: bool) -> bool:
+    """Run LDView once to save a snapshot of model_path."""
+    args = [ldview_cmd, model_path, f"-SaveSnapshot={output_path}", *_ldview_options(width, height)]
+    
+    try:
+        subprocess.run(args, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        return True
     except subprocess.CalledProcessError as e:
         if not silent_errors:
             print(f"LDView failed: {e.stderr}")
-        success = False
+        return False
     except FileNotFoundError:
         if not silent_errors:
             print("LDView executable not found.")
-        success = False
-    finally:
-        if os.path.exists(tmp_path):
-            os.unlink(tmp_path)
-            
-    return success
+        return False
 
@@ -1,20 +1,34 @@
-from typing import List, Optional, Tuple
-from rtree import index
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from scipy.spatial import cKDTree
 from validator.parser import Placement
-from validator.catalog_db import get_part, PartInfo
+from validator.catalog_db import get_parts, PartInfo, EMPTY_POINTS
 from validator.geometry import get_world_aabb
 
 class SceneGraph:
     def __init__(self):
         self.placements: List[Placement] = []
-        p = index.Property()
-        p.dimension = 3
-        self.index = index.Index(properties=p)
         self._next_id = 0
+        # World AABBs in insertion order, stacked into arrays on demand
+        self._aabb_mins: List[Tuple[float, float, float]] = []
+        self._aabb_maxs: List[Tuple[float, float, float]] = []
+        self._aabb_arrays: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        # KD-tree over AABB centers, rebuilt on the first query after adds
+        self._tree: Optional[cKDTree] = None
+        self._max_radius = 0.0
+        # World stud / anti-stud buffers, built by finalize()
+        self._finalized = False
+        self.world_studs = np.empty((0, 3), dtype=np.float32)
+        self.stud_owner = np.empty(0, dtype=np.intp)
+        self.world_antistuds = np.empty((0, 3), dtype=np.float32)
+        self.antistud_owner = np.empty(0, dtype=np.intp)
+        self._stud_offsets = np.zeros(1, dtype=np.intp)
+        self._antistud_offsets = np.zeros(1, dtype=np.intp)
 
     def add_placement(self, placement: Placement) -> int:
         """
-        Add a placement to the scene graph and spatial index.
+        Add a placement to the scene graph.
+        The spatial index is rebuilt in bulk on the next query.
         Returns the internal ID of the added placement.
         """
         pid = self._next_id
@@ -23,29 +37,113 @@ class SceneGraph:
         self.placements.append(placement)
         
         # Calculate AABB for spatial indexing
-        (min_x, min_y, min_z), (max_x, max_y, max_z) = get_world_aabb(placement)
-        # print(f"Adding placement {pid}: AABB ({min_x}, {min_y}, {min_z}) - ({max_x}, {max_y}, {max_z})")
-        
-        # Rtree expects (minx, miny, maxx, maxy) for 2D or (minx, miny, minz, maxx, maxy, maxz) for 3D
-        # We need to ensure we are using 3D if we want Z queries
-        # But standard rtree properties might default to 2D. 
-        # For simplicity in this POC, we can use 3D coordinates.
-        
-        self.index.insert(pid, (min_x, min_y, min_z, max_x, max_y, max_z))
+        min_pt, max_pt = get_world_aabb(placement)
+        self._aabb_mins.append(min_pt)
+        self._aabb_maxs.append(max_pt)
+        self._aabb_arrays = None
+        self._tree = None
+        self._finalized = False
         
         return pid
 
     def get_placement(self, pid: int) -> Placement:
         return self.placements[pid]
 
+    def aabb_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return (mins, maxs) world AABBs of all placements as (N, 3) float32
+        arrays. Rows are indexed by placement ID.
+        """
+        if self._aabb_arrays is None:
+            mins = np.array(self._aabb_mins, dtype=np.float32).reshape(-1, 3)
+            maxs = np.array(self._aabb_maxs, dtype=np.float32).reshape(-1, 3)
+            self._aabb_arrays = (mins, maxs)
+        return self._aabb_arrays
+
+    def finalize(self) -> None:
+        """
+        Precompute world-space studs and anti-studs of every placement.
+        Results are stored as contiguous (S, 3) float32 arrays with a parallel
+        owner array mapping each row back to its placement ID.
+        """
+        infos = get_parts(p.part_id for p in self.placements)
+        self.world_studs, self.stud_owner, self._stud_offsets = self._world_points(infos, "stud_array")
+        self.world_antistuds, self.antistud_owner, self._antistud_offsets = self._world_points(infos, "anti_stud_array")
+        self._finalized = True
+
+    def world_studs_of(self, pid: int) -> np.ndarray:
+        """World-space studs of one placement, as a view into world_studs."""
+        if not self._finalized:
+            self.finalize()
+        return self.world_studs[self._stud_offsets[pid]:self._stud_offsets[pid + 1]]
+
+    def world_antistuds_of(self, pid: int) -> np.ndarray:
+        """World-space anti-studs of one placement, as a view into world_antistuds."""
+        if not self._finalized:
+            self.finalize()
+        return self.world_antistuds[self._antistud_offsets[pid]:self._antistud_offsets[pid + 1]]
+
+    def _world_points(self, infos: Dict[str, Optional[PartInfo]], attr: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Transform one kind of local part point (e.g. "stud_array") into world space
+        for all placements. Returns (points, owner, offsets).
+        """
+        n = len(self.placements)
+        templates = {part_id: getattr(info, attr) if info else EMPTY_POINTS for part_id, info in infos.items()}
+        
+        groups: Dict[str, List[int]] = {}
+        for i, p in enumerate(self.placements):
+            groups.setdefault(p.part_id, []).append(i)
+        
+        counts = np.array([len(templates[p.part_id]) for p in self.placements], dtype=np.intp)
+        offsets = np.zeros(n + 1, dtype=np.intp)
+        np.cumsum(counts, out=offsets[1:])
+        points = np.empty((offsets[-1], 3), dtype=np.float32)
+        
+        # One batched transform per distinct part: world = R @ local + t
+        for part_id, idx in groups.items():
+            template = templates[part_id]
+            if not len(template):
+                continue
+            rots = np.array([self.placements[i].rotation for i in idx], dtype=np.float32).reshape(-1, 3, 3)
+            pos = np.array([self.placements[i].position for i in idx], dtype=np.float32).reshape(-1, 3)
+            world = np.einsum('nij,sj->nsi', rots, template) + pos[:, None, :]
+            rows = offsets[idx][:, None] + np.arange(len(template))
+            points[rows] = world
+        
+        owner = np.repeat(np.arange(n), counts)
+        return points, owner, offsets
+
+    def _spatial_index(self) -> cKDTree:
+        """KD-tree over AABB centers, built in one go from aabb_arrays()."""
+        if self._tree is None:
+            # cKDTree works in float64; widen first so the radius bound is not
+            # lost to float32 rounding
+            mins, maxs = (a.astype(np.float64) for a in self.aabb_arrays())
+            self._tree = cKDTree((mins + maxs) / 2)
+            # Largest AABB half-diagonal, to widen center-distance queries
+            self._max_radius = float(np.linalg.norm((maxs - mins) / 2, axis=1).max(initial=0.0))
+        return self._tree
+
     def query_box(self, min_pt: Tuple[float, float, float], max_pt: Tuple[float, float, float]) -> List[int]:
         """
-        Find all placements that intersect with the given bounding box.
+        Find all placements that intersect with the given bounding box
+        (touching counts). Returns placement IDs in ascending order.
         """
-        return list(self.index.intersection((
-            min_pt[0], min_pt[1], min_pt[2],
-            max_pt[0], max_pt[1], max_pt[2]
-        )))
+        if not self.placements:
+            return []
+        tree = self._spatial_index()
+        lo = np.asarray(min_pt, dtype=np.float64)
+        hi = np.asarray(max_pt, dtype=np.float64)
+        
+        # An AABB can only intersect the box if its center lies within both
+        # half-diagonals of the box center; the exact test then filters.
+        radius = float(np.linalg.norm((hi - lo) / 2)) + self._max_radius
+        candidates = np.array(tree.query_ball_point((lo + hi) / 2, radius), dtype=np.intp)
+        
+        mins, maxs = self.aabb_arrays()
+        hit = ((mins[candidates] <= hi) & (maxs[candidates] >= lo)).all(axis=1)
+        return sorted(candidates[hit].tolist())
 
     def query_point(self, point: Tuple[float, float, float], tolerance: float = 0.1) -> List[int]:
         """
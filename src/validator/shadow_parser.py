@@ -1,238 +1,381 @@
+import logging
+import multiprocessing
 import os
 import re
-from typing import List, Dict, Any, Optional
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple, Iterable
+import numpy as np
+from validator.catalog_db import GENDER_CODES
+from validator.geometry_kernels import apply_transform
+
+_log = logging.getLogger(__name__)
+
+SNAP_PREFIX = b'0 !LDCAD SNAP_'
+
+# [key=value] or [key=v1 v2 v3...]; values can contain spaces, e.g. [pos=0 24 0]
+_PROP_RE = re.compile(r'\[([A-Za-z0-9_]+)=([^\]]+)\]')
+
+GENDER_NAMES = {code: name for name, code in GENDER_CODES.items()}
+
+# Property values that recur on most SNAP lines; one shared string each
+_COMMON_VALUES = {v: v for v in ('M', 'F', 'U', 'one', 'none', 'both', 'R', 'C')}
+
+IDENTITY_ORI = '1 0 0 0 1 0 0 0 1'
+
+# One record per connection point, for consumers that want a single flat buffer
+POINT_DTYPE = np.dtype([('type', 'S12'), ('gender', 'S1'), ('pos', '3f8'), ('ori', '9f8')])
+
+_ZERO_VEC = (0.0, 0.0, 0.0)
+_IDENT_MAT = (1.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 1.0)
+
+@lru_cache(maxsize=4096)
+def _parse_floats(s: str) -> Tuple[float, ...]:
+    # Shadow files repeat the same pos/ori literals thousands of times
+    if s == '0 0 0':
+        return _ZERO_VEC
+    if s == IDENTITY_ORI:
+        return _IDENT_MAT
+    return tuple(float(x) for x in s.split())
+
+@lru_cache(maxsize=1024)
+def _grid_offsets(grid: str) -> Optional[np.ndarray]:
+    """
+    (K, 3) offsets of the grid points from the base position, in
+    grid order (X outer, Z inner); None if the syntax is not recognised.
+    Cached per grid string (the same few grids recur across the library),
+    so the array is read-only.
+    """
+    # Grid syntax: [grid=Type N Steps Start Delta ...]
+    # C N M (Circle/Rect?) or generic?
+    # Example from 3003s01.dat: [grid=C 2 C 2 20 20]
+    # This implies a 2x2 grid.
+    # Let's handle "C N C M SpacingX SpacingY" logic if standard
+    # Or "C X_Count C Z_Count Spacing_X Spacing_Z"?
+
+    # NOTE: LDCad docs/source would be better, but assuming "C count C count spacing spacing"
+    # based on context (circles/centers?)
+
+    grid_tokens = grid.split()
+    if len(grid_tokens) >= 6 and grid_tokens[0] == 'C' and grid_tokens[2] == 'C':
+        # Rectangular grid centered: C count_x C count_z spacing_x spacing_z
+        count_x = int(grid_tokens[1])
+        count_z = int(grid_tokens[3])
+        spacing_x = float(grid_tokens[4])
+        spacing_z = float(grid_tokens[5])
+    elif len(grid_tokens) >= 5 and grid_tokens[0] == 'C':
+        # Single-row or simple grid: C count_x count_z spacing_x spacing_z
+        # Example: "C 2 1 20 0" means 2 columns, 1 row, 20 spacing in X, 0 in Z
+        count_x = int(grid_tokens[1])
+        count_z = int(grid_tokens[2])
+        spacing_x = float(grid_tokens[3])
+        spacing_z = float(grid_tokens[4])
+    else:
+        return None
+
+    # Centered on the base position, in the local XZ plane
+    xs = -((count_x - 1) * spacing_x) / 2 + np.arange(count_x) * spacing_x
+    zs = -((count_z - 1) * spacing_z) / 2 + np.arange(count_z) * spacing_z
+    gx, gz = np.meshgrid(xs, zs, indexing='ij')
+    offsets = np.zeros((gx.size, 3))
+    offsets[:, 0] = gx.ravel()
+    offsets[:, 2] = gz.ravel()
+    offsets.flags.writeable = False
+    return offsets
+
+def _empty_soa() -> Dict[str, Any]:
+    return _make_soa([], np.empty(0, dtype=np.int8), [], [], np.empty((0, 3)), np.empty((0, 3, 3)))
+
+def _make_soa(types, genders, roles, properties, pos, ori) -> Dict[str, Any]:
+    """
+    Connection points as parallel arrays (structure of arrays):
+    types, roles and properties are lists; genders is an int8 array of
+    GENDER_CODES; pos is (N, 3) and ori (N, 3, 3), both float64.
+    """
+    return {'types': types, 'genders': genders, 'roles': roles, 'properties': properties, 'pos': pos, 'ori': ori}
+
+def _concat_soa(blocks: List[Dict[str, Any]]) -> Dict[str, Any]:
+    if not blocks:
+        return _empty_soa()
+    if len(blocks) == 1:
+        return blocks[0]
+    return _make_soa(
+        [t for b in blocks for t in b['types']],
+        np.concatenate([b['genders'] for b in blocks]),
+        [r for b in blocks for r in b['roles']],
+        [p for b in blocks for p in b['properties']],
+        np.concatenate([b['pos'] for b in blocks]),
+        np.concatenate([b['ori'] for b in blocks]),
+    )
+
+# Below this many uncached files, preload parses in-process
+PRELOAD_MIN_FILES = 8
+
+# One parser per library in each process (preload workers, catalog build workers),
+# so the file index and inclusion caches are shared across the files it handles
+_worker_parsers: Dict[str, "ShadowParser"] = {}
+
+def shared_parser(shadow_lib_path: str) -> "ShadowParser":
+    """This process's ShadowParser for a library; the library is walked once per process."""
+    parser = _worker_parsers.get(shadow_lib_path)
+    if parser is None:
+        parser = _worker_parsers[shadow_lib_path] = ShadowParser(shadow_lib_path)
+    return parser
+
+def _parse_one(shadow_lib_path: str, part_filename: str) -> Optional[Dict[str, Any]]:
+    """Worker for ShadowParser.preload: parse one file, None if it does not exist."""
+    parser = shared_parser(shadow_lib_path)
+    parser.parse_part_soa(part_filename)
+    return parser._soa_cache.get(part_filename)
 
 class ShadowParser:
     """
     Parses LDraw files (specifically shadow library files) to extract LDCad connectivity data.
     """
-    
+
     def __init__(self, shadow_lib_path: str):
         self.shadow_lib_path = shadow_lib_path
         self._cache: Dict[str, List[Dict[str, Any]]] = {}
+        self._soa_cache: Dict[str, Dict[str, Any]] = {}
+        # Normalized reference -> resolved file path (None if not found)
+        self._path_cache: Dict[str, Optional[str]] = {}
+        # Built on first lookup by _get_file_index
+        self._file_index: Optional[Dict[str, str]] = None
+        # (ref, pos, ori) of a SNAP_INCL -> its transformed points
+        self._incl_cache: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
 
     def parse_part(self, part_filename: str) -> List[Dict[str, Any]]:
         """
         Parses a part file (and its dependencies) to return a list of connection points.
         The part_filename should be relative to the shadow library root (e.g. 'parts/3001.dat').
+        Each point is a dict; see parse_part_soa for the array form.
         """
         if part_filename in self._cache:
             return self._cache[part_filename]
 
-        full_path = os.path.join(self.shadow_lib_path, part_filename)
-        if not os.path.exists(full_path):
-            # Try finding it in 'parts' or 'p' if not found directly, or normalize separators
-            normalized = part_filename.replace('\\', os.sep).replace('/', os.sep)
-            full_path = os.path.join(self.shadow_lib_path, normalized)
-            
-            if not os.path.exists(full_path):
-                 # Try prepending 'parts' and 'p'
-                 for sub in ['parts', 'p']:
-                     candidate = os.path.join(self.shadow_lib_path, sub, normalized)
-                     if os.path.exists(candidate):
-                         full_path = candidate
-                         break
-                 else:
-                     # One last try: if it has 's\' prefix, maybe it is in parts/s?
-                     # (Covered by 'parts' + normalized if normalized is s/...)
-                     # If still not found, return empty
-                     print(f"Warning: Could not find shadow file: {part_filename}")
-                     return []
-
-        connection_points = []
-        
+        soa = self.parse_part_soa(part_filename)
+        connection_points = [
+            {
+                'type': cmd_type,
+                'gender': GENDER_NAMES[gender],
+                'role': role,
+                'properties': props,
+                'pos': pos,
+                'ori': ori,
+            }
+            for cmd_type, gender, role, props, pos, ori in zip(
+                soa['types'], soa['genders'].tolist(), soa['roles'], soa['properties'],
+                soa['pos'].tolist(), soa['ori'].reshape(-1, 9).tolist())
+        ]
+        if part_filename in self._soa_cache:
+            self._cache[part_filename] = connection_points
+        return connection_points
+
+    def parse_part_array(self, part_filename: str) -> np.ndarray:
+        """
+        Like parse_part, but returns the connection points as a POINT_DTYPE
+        structured array (type and gender as ASCII bytes).
+        """
+        soa = self.parse_part_soa(part_filename)
+        arr = np.empty(len(soa['types']), dtype=POINT_DTYPE)
+        arr['type'] = soa['types']
+        arr['gender'] = [GENDER_NAMES[g] for g in soa['genders'].tolist()]
+        arr['pos'] = soa['pos']
+        arr['ori'] = soa['ori'].reshape(-1, 9)
+        return arr
+
+    def preload(self, part_filenames: Iterable[str], max_workers: Optional[int] = None) -> None:
+        """
+        Parse many independent files up front, in a process pool.
+        Each worker resolves inclusions with its own cache; results are
+        merged into this parser's cache, so later parse_part calls are lookups.
+        """
+        pending = list(dict.fromkeys(fn for fn in part_filenames if fn not in self._soa_cache))
+        if len(pending) < PRELOAD_MIN_FILES:
+            for fn in pending:
+                self.parse_part_soa(fn)
+            return
+
+        # spawn: forking a process that already runs numba or thread-pool
+        # threads can deadlock the children
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            results = pool.map(_parse_one, [self.shadow_lib_path] * len(pending), pending,
+                               chunksize=max(1, len(pending) // (4 * (max_workers or os.cpu_count() or 1))))
+            for fn, soa in zip(pending, results):
+                if soa is not None:
+                    self._soa_cache[fn] = soa
+
+    def parse_part_soa(self, part_filename: str) -> Dict[str, Any]:
+        """
+        Like parse_part, but returns the connection points as parallel arrays
+        (see _make_soa). Inclusions are transformed as whole arrays.
+        """
+        if part_filename in self._soa_cache:
+            return self._soa_cache[part_filename]
+
+        full_path = self._resolve(part_filename)
+        if full_path is None:
+            return _empty_soa()
+
+        blocks = []
+
         try:
-            with open(full_path, 'r', encoding='utf-8', errors='replace') as f:
-                for line in f:
-                    line = line.strip()
-                    if not line.startswith('0 !LDCAD SNAP'):
-                        continue
-                    
-                    # We have a SNAP command
-                    cmd_type_match = re.match(r'0 !LDCAD (SNAP_[A-Z]+)\s*(.*)', line)
-                    if not cmd_type_match:
-                        continue
-                    
-                    cmd_type = cmd_type_match.group(1)
-                    args_str = cmd_type_match.group(2)
-                    
+            # Binary scan: only the SNAP lines are decoded
+            with open(full_path, 'rb') as f:
+                data = f.read()
+            # Pure geometry files have no SNAP meta at all
+            if b'!LDCAD SNAP' in data:
+                for line in data.splitlines():
+                    if not line.startswith(SNAP_PREFIX):
+                        if line[:1] not in (b' ', b'\t') or not line.lstrip().startswith(SNAP_PREFIX):
+                            continue
+                    line = line.decode('utf-8', errors='replace').strip()
+
+                    # We have a SNAP command: "0 !LDCAD SNAP_<TYPE> [key=value] ..."
+                    parts = line.split(None, 3)
+                    cmd_type, bracket, rest = parts[2].partition('[')
+                    args_str = bracket + rest
+                    if len(parts) > 3:
+                        args_str += ' ' + parts[3]
+
                     properties = self._parse_properties(args_str)
-                    
+                    if not self._has_valid_transform(properties):
+                        # Points are stored as (N, 3) / (N, 3, 3) arrays; a short vector would not fit
+                        _log.warning("Skipping SNAP line with malformed pos/ori in %s: %s", part_filename, line)
+                        continue
+
                     if cmd_type == 'SNAP_INCL':
                         # Recursive inclusion
                         ref_file = properties.get('ref')
                         if ref_file:
-                            included_points = self.parse_part(ref_file)
-                            # Apply transformations if 'pos'/'ori'/'matrix' are present on the INCL line
-                            # NOTE: The shadow library spec says INCL usually just pulls in the definitions.
-                            # Often they are used for primitives stud.dat etc.
-                            # If the INCL line has transformations, they apply to the imported points.
-                            transformed = self._transform_points(included_points, properties)
-                            connection_points.extend(transformed)
+                            # The same primitive (stud.dat etc.) is included at the same
+                            # pos/ori over and over; the result only depends on those three
+                            incl_key = (ref_file, properties.get('pos', ''), properties.get('ori', ''))
+                            transformed = self._incl_cache.get(incl_key)
+                            if transformed is None:
+                                included = self.parse_part_soa(ref_file)
+                                # Apply transformations if 'pos'/'ori'/'matrix' are present on the INCL line
+                                # NOTE: The shadow library spec says INCL usually just pulls in the definitions.
+                                # Often they are used for primitives stud.dat etc.
+                                # If the INCL line has transformations, they apply to the imported points.
+                                transformed = self._transform_points(included, properties)
+                                self._incl_cache[incl_key] = transformed
+                            blocks.append(transformed)
                     else:
                         # It's a definition (SNAP_CYL, SNAP_FGR, SNAP_GEN)
                         # We need to handle grids here or in normalization
-                        points = self._expand_grid(cmd_type, properties)
-                        connection_points.extend(points)
-                        
+                        blocks.append(self._expand_grid(cmd_type, properties))
+
         except Exception as e:
-            print(f"Error parsing {part_filename}: {e}")
-            
-        self._cache[part_filename] = connection_points
-        return connection_points
+            _log.error("Error parsing %s: %s", part_filename, e)
+
+        soa = _concat_soa(blocks)
+        self._soa_cache[part_filename] = soa
+        return soa
+
+    def _resolve(self, part_filename: str) -> Optional[str]:
+        """
+        Find the file for a reference relative to the shadow library root.
+        Looks the reference up directly, then under parts/ and p/, in an index
+        of the library built once; results, including misses, are cached.
+        LDraw references are case-insensitive, so the lookup is too.
+        """
+        key = part_filename.replace('\\', '/').lower()
+        if key in self._path_cache:
+            return self._path_cache[key]
+
+        index = self._get_file_index()
+        # parts/ also covers 's/...' subpart references
+        for candidate in (key, 'parts/' + key, 'p/' + key):
+            full_path = index.get(candidate)
+            if full_path is not None:
+                break
+        else:
+            _log.warning("Could not find shadow file: %s", part_filename)
+
+        self._path_cache[key] = full_path
+        return full_path
+
+    def _get_file_index(self) -> Dict[str, str]:
+        """Lower-cased 'sub/dir/name.dat' path -> full path of every file in the library."""
+        if self._file_index is None:
+            index: Dict[str, str] = {}
+            for root, _, files in os.walk(self.shadow_lib_path):
+                rel = os.path.relpath(root, self.shadow_lib_path).replace(os.sep, '/')
+                prefix = '' if rel == '.' else rel.lower() + '/'
+                for name in files:
+                    index.setdefault(prefix + name.lower(), os.path.join(root, name))
+            self._file_index = index
+        return self._file_index
 
     def _parse_properties(self, args_str: str) -> Dict[str, str]:
         """
         Parses string like "[gender=M] [caps=one]" into a dict.
         """
-        props = {}
-        # Regex to find [key=value] or [key=v1 v2 v3...]
-        # Value can contain spaces. e.g. [pos=0 24 0]
         # We assume brackets are balanced and not nested for now.
-        matches = re.finditer(r'\[([a-zA-Z0-9_]+)=([^\]]+)\]', args_str)
-        for m in matches:
-            key = m.group(1)
-            val = m.group(2).strip()
-            props[key] = val
+        # findall returns plain (key, value) tuples, no Match objects.
+        # Keys come from a small vocabulary, so intern them.
+        props = {}
+        for key, val in _PROP_RE.findall(args_str):
+            val = val.strip()
+            props[sys.intern(key)] = _COMMON_VALUES.get(val, val)
         return props
 
-    def _expand_grid(self, cmd_type: str, props: Dict[str, str]) -> List[Dict[str, Any]]:
-        """
-        Takes a single SNAP definition and returns a list of points (usually 1, unless grid is used).
-        """
-        base_point = {
-            'type': cmd_type,
-            'gender': props.get('gender', 'U'), # U for Unknown/Universal
-            'role': props.get('id', 'unknown'), # generic ID if provided
-            'properties': props, # Keep raw properties for specialized logic
-            'pos': self._parse_vector(props.get('pos', '0 0 0')),
-            'ori': self._parse_matrix(props.get('ori', '1 0 0 0 1 0 0 0 1'))
-        }
-        
-        if 'grid' not in props:
-            return [base_point]
-            
-        # Grid syntax: [grid=Type N Steps Start Delta ...] 
-        # C N M (Circle/Rect?) or generic?
-        # Example from 3003s01.dat: [grid=C 2 C 2 20 20]
-        # This implies a 2x2 grid.
-        # Let's handle "C N C M SpacingX SpacingY" logic if standard
-        # Or "C X_Count C Z_Count Spacing_X Spacing_Z"?
-        
-        # NOTE: LDCad docs/source would be better, but assuming "C count C count spacing spacing" 
-        # based on context (circles/centers?)
-        
-        grid_tokens = props['grid'].split()
-        if len(grid_tokens) >= 6 and grid_tokens[0] == 'C' and grid_tokens[2] == 'C':
-            # Rectangular grid centered: C count_x C count_z spacing_x spacing_z
-            count_x = int(grid_tokens[1])
-            count_z = int(grid_tokens[3])
-            spacing_x = float(grid_tokens[4])
-            spacing_z = float(grid_tokens[5])
-            
-            points = []
-            
-            # center offset
-            start_x = -((count_x - 1) * spacing_x) / 2
-            start_z = -((count_z - 1) * spacing_z) / 2
-            
-            for ix in range(count_x):
-                for iz in range(count_z):
-                    px = start_x + (ix * spacing_x)
-                    pz = start_z + (iz * spacing_z)
-                    
-                    # Create new point copy
-                    new_p = base_point.copy()
-                    # Apply offset to base pos
-                    # Assuming grid is local XZ plane usually?
-                    base_pos = new_p['pos']
-                    new_p['pos'] = [
-                        base_pos[0] + px,
-                        base_pos[1],
-                        base_pos[2] + pz
-                    ]
-                    points.append(new_p)
-            return points
-        elif len(grid_tokens) >= 5 and grid_tokens[0] == 'C':
-            # Single-row or simple grid: C count_x count_z spacing_x spacing_z
-            # Example: "C 2 1 20 0" means 2 columns, 1 row, 20 spacing in X, 0 in Z
-            count_x = int(grid_tokens[1])
-            count_z = int(grid_tokens[2])
-            spacing_x = float(grid_tokens[3])
-            spacing_z = float(grid_tokens[4])
-            
-            points = []
-            
-            # center offset
-            start_x = -((count_x - 1) * spacing_x) / 2
-            start_z = -((count_z - 1) * spacing_z) / 2
-            
-            for ix in range(count_x):
-                for iz in range(count_z):
-                    px = start_x + (ix * spacing_x)
-                    pz = start_z + (iz * spacing_z)
-                    
-                    # Create new point copy
-                    new_p = base_point.copy()
-                    base_pos = new_p['pos']
-                    new_p['pos'] = [
-                        base_pos[0] + px,
-                        base_pos[1],
-                        base_pos[2] + pz
-                    ]
-                    points.append(new_p)
-            return points
-            
-        return [base_point]
-        
-    def _parse_vector(self, s: str) -> List[float]:
-        return [float(x) for x in s.split()]
+    def _expand_grid(self, cmd_type: str, props: Dict[str, str]) -> Dict[str, Any]:
+        """
+        Takes a single SNAP definition and returns its points (usually 1,
+        unless grid is used) as parallel arrays.
+        """
+        base_pos = np.array(self._parse_vector(props.get('pos', '0 0 0')), dtype=np.float64)
+        base_ori = np.array(self._parse_matrix(props.get('ori', IDENTITY_ORI)), dtype=np.float64).reshape(3, 3)
+
+        offsets = _grid_offsets(props['grid']) if 'grid' in props else None
+        if offsets is None:
+            positions = base_pos[None, :]
+        else:
+            positions = base_pos + offsets
+
+        n = len(positions)
+        gender = props.get('gender', 'U') # U for Unknown/Universal
+        return _make_soa(
+            [cmd_type] * n,
+            np.full(n, GENDER_CODES.get(gender, 0), dtype=np.int8),
+            [props.get('id', 'unknown')] * n, # generic ID if provided
+            [props] * n, # Keep raw properties for specialized logic
+            positions,
+            np.broadcast_to(base_ori, (n, 3, 3)),
+        )
 
-    def _parse_matrix(self, s: str) -> List[float]:
+    def _has_valid_transform(self, props: Dict[str, str]) -> bool:
+        """True if the pos and ori properties (when given) have 3 and 9 values."""
+        return (len(self._parse_vector(props.get('pos', '0 0 0'))) == 3
+                and len(self._parse_matrix(props.get('ori', IDENTITY_ORI))) == 9)
+
+    def _parse_vector(self, s: str) -> Tuple[float, ...]:
+        return _parse_floats(s)
+
+    def _parse_matrix(self, s: str) -> Tuple[float, ...]:
         # LDraw orientation is 9 floats: R11 R12 R13 R21...
         # LDCad 'ori' prop is usually standard rotation matrix
-        return [float(x) for x in s.split()]
+        return _parse_floats(s)
 
-    def _transform_points(self, points: List[Dict[str, Any]], props: Dict[str, str]) -> List[Dict[str, Any]]:
+    def _transform_points(self, points: Dict[str, Any], props: Dict[str, str]) -> Dict[str, Any]:
         """
-        Apply transformation (pos/ori) to a list of points.
+        Apply transformation (pos/ori) to a set of points (parallel arrays).
         Useful for SNAP_INCL.
         """
         # If no transform, return as is
         if 'pos' not in props and 'ori' not in props:
             return points
 
-        offset = self._parse_vector(props.get('pos', '0 0 0'))
-        rotation = self._parse_matrix(props.get('ori', '1 0 0 0 1 0 0 0 1'))
-
-        transformed = []
-        for p in points:
-            new_p = p.copy()
-            # Apply rotation to position
-            old_pos = p['pos']
-            
-            # Matrix mult: Rot * old_pos
-            rx = rotation[0]*old_pos[0] + rotation[1]*old_pos[1] + rotation[2]*old_pos[2]
-            ry = rotation[3]*old_pos[0] + rotation[4]*old_pos[1] + rotation[5]*old_pos[2]
-            rz = rotation[6]*old_pos[0] + rotation[7]*old_pos[1] + rotation[8]*old_pos[2]
-            
-            # Add offset
-            new_p['pos'] = [rx + offset[0], ry + offset[1], rz + offset[2]]
-            
-            # Update orientation (ParentRot * ChildRot)
-            # This is simplified; we might need full matrix mult for 'ori'
-            # For now, let's assume strict validation mostly looks at position
-            # and generic "up vector" alignment.
-            # TODO: Full matrix multiplication for orientation
-            
-            transformed.append(new_p)
-            
-        return transformed
+        offset = np.array(self._parse_vector(props.get('pos', '0 0 0')), dtype=np.float64)
+        rotation = np.array(self._parse_matrix(props.get('ori', IDENTITY_ORI)), dtype=np.float64).reshape(3, 3)
 
-if __name__ == "__main__":
-    # Quick test
-    import json
-    parser = ShadowParser(r"data\offLibShadow")
-    # Test with a known file if it exists
-    res = parser.parse_part("parts/3003.dat")
-    print(json.dumps(res, indent=2))
+        # Rot * old_pos + offset
+        # Orientation is left as is (ParentRot * ChildRot would be needed for
+        # strict vector matching; validation currently only looks at position)
+        # TODO: Full matrix multiplication for orientation
+        transformed = dict(points)
+        transformed['pos'] = apply_transform(np.ascontiguousarray(points['pos']), rotation, offset)
+        return transformed
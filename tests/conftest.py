@@ -3,18 +3,18 @@ import json
 from pathlib import Path
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_data_dir() -> Path:
     return Path(__file__).parent.parent / "test_data"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def manifest(test_data_dir) -> dict:
     manifest_path = test_data_dir / "manifest.json"
     return json.loads(manifest_path.read_text())
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def valid_cases(manifest, test_data_dir) -> list[tuple[dict, Path]]:
     """Returns list of (case_info, file_path) for valid test cases."""
     cases = []
@@ -24,7 +24,7 @@ def valid_cases(manifest, test_data_dir) -> list[tuple[dict, Path]]:
     return cases
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def invalid_cases(manifest, test_data_dir) -> list[tuple[dict, Path]]:
     """Returns list of (case_info, file_path) for invalid test cases."""
     cases = []
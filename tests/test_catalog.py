@@ -1,5 +1,7 @@
+import sqlite3
 import pytest
-from validator.catalog_db import get_part, STUD_PRIMITIVES
+import numpy as np
+from validator.catalog_db import get_part, get_parts, init_db, save_part, PartInfo, STUD_PRIMITIVES, EMPTY_POINTS, GENDER_CODES, CONNECTION_TYPE_CODES
 
 class TestCatalogUnits:
     def test_stud_primitives_detection(self):
@@ -31,3 +33,64 @@ class TestCatalogUnits:
             matching_anti = [a for a in info.anti_studs if a[0] == s[0] and a[2] == s[2]]
             assert matching_anti, "Should have explicit or heuristic anti-stud below stud"
             assert matching_anti[0][1] == 24.0
+
+    def test_point_arrays(self):
+        info = get_part("3001")
+        assert info.stud_array.shape == (8, 3)
+        assert info.stud_array.dtype == np.float32
+        assert np.allclose(info.stud_array, info.studs)
+        assert info.anti_stud_array.shape == (len(info.anti_studs), 3)
+        
+        # Stud-less parts share one well-formed (0, 3) array
+        tile = get_part("3069b")
+        assert tile.stud_array.shape == (0, 3)
+        assert tile.stud_array is EMPTY_POINTS
+
+    def test_connection_point_codes(self):
+        info = get_part("3001")
+        cps = info.connection_points
+        assert info.connection_genders.dtype == np.int8
+        assert list(info.connection_genders) == [GENDER_CODES[cp['gender']] for cp in cps]
+        assert list(info.connection_type_codes) == [CONNECTION_TYPE_CODES[cp['type']] for cp in cps]
+
+    def test_bounds_corners(self):
+        info = get_part("3001")
+        assert info.corners.shape == (8, 3)
+        assert np.allclose(info.corners.min(axis=0), [info.bounds[a][0] for a in "xyz"])
+        assert np.allclose(info.corners.max(axis=0), [info.bounds[a][1] for a in "xyz"])
+
+    def test_get_parts_bulk(self):
+        infos = get_parts(["3001", "3069b", "3001", "no_such_part"])
+        assert list(infos) == ["3001", "3069b", "no_such_part"]
+        assert infos["3001"] == get_part("3001")
+        assert infos["no_such_part"] is None
+
+
+class TestCatalogSchema:
+    def test_save_part_stores_counts(self, tmp_path):
+        conn = init_db(tmp_path / "catalog.db")
+        save_part(conn, PartInfo(
+            part_id="3001", part_name="Brick 2 x 4", type="Brick", category=None, ldraw_org="Part",
+            height=24.0, bounds={}, studs=[(0, 0, 0)] * 8, anti_studs=[(0, 24, 0)] * 3,
+            technic_holes=[], extraction_status="success",
+            connection_points=[{"type": "SNAP_CYL", "gender": "M", "pos": [0, 0, 0]}]))
+        row = conn.execute(
+            "SELECT stud_count, anti_stud_count, technic_hole_count, connection_count FROM parts").fetchone()
+        assert row == (8, 3, 0, 1)
+        conn.close()
+
+    def test_counts_backfilled_on_migration(self, tmp_path):
+        db_path = tmp_path / "catalog.db"
+        old = sqlite3.connect(db_path)
+        old.execute("CREATE TABLE parts (part_id TEXT PRIMARY KEY, category TEXT, studs_json TEXT, anti_studs_json TEXT, "
+                    "technic_holes_json TEXT, extraction_status TEXT, connection_points_json TEXT, "
+                    "connection_types_json TEXT)")
+        old.execute("INSERT INTO parts VALUES ('a', NULL, '[[0,0,0],[1,0,0]]', '', NULL, 'success', '[]', '[]')")
+        old.commit()
+        old.close()
+
+        conn = init_db(db_path)
+        row = conn.execute(
+            "SELECT stud_count, anti_stud_count, technic_hole_count, connection_count FROM parts").fetchone()
+        assert row == (2, 0, 0, 0)
+        conn.close()
@@ -1,7 +1,8 @@
 import pytest
 from validator.scene_graph import SceneGraph
 from validator.parser import Placement
-from validator.collision import check_collisions
+from validator.collision import check_collisions, SMALL_SCENE_THRESHOLD
+from validator.geometry import check_collision
 
 class TestCollisionUnits:
     
@@ -71,3 +72,39 @@ class TestCollisionUnits:
         
         collisions = check_collisions(sg)
         assert len(collisions) == 0
+
+    def test_large_scene_uses_index(self):
+        sg = SceneGraph()
+        # A row of well-separated bricks, large enough to take the spatial index path
+        for k in range(SMALL_SCENE_THRESHOLD + 8):
+            sg.add_placement(Placement("3001", 1, (k * 100, 0, 0), (1,0,0,0,1,0,0,0,1)))
+        # One brick overlapping brick 5
+        overlap_id = sg.add_placement(Placement("3001", 1, (510, 0, 0), (1,0,0,0,1,0,0,0,1)))
+        
+        collisions = check_collisions(sg)
+        assert collisions == [(5, overlap_id)]
+
+    def test_sweep_and_prune_matches_index(self):
+        sg = SceneGraph()
+        # Grid of bricks with a few deliberate overlaps mixed in
+        for k in range(SMALL_SCENE_THRESHOLD + 8):
+            x = (k % 8) * 80
+            z = (k // 8) * 60
+            sg.add_placement(Placement("3001", 1, (x, 0, z), (1,0,0,0,1,0,0,0,1)))
+        sg.add_placement(Placement("3001", 1, (90, 0, 10), (1,0,0,0,1,0,0,0,1)))
+        sg.add_placement(Placement("3001", 1, (330, -10, 120), (0,0,1,0,1,0,-1,0,0)))
+        
+        index_hits = check_collisions(sg, broad_phase="index")
+        sap_hits = check_collisions(sg, broad_phase="sap")
+        assert index_hits
+        assert sorted(sap_hits) == sorted(index_hits)
+
+    def test_check_collision_pair(self):
+        ident = (1,0,0,0,1,0,0,0,1)
+        base = Placement("3001", 1, (0, 0, 0), ident)
+        # 2x4 brick spans 80 LDU in X: 0.4 LDU overlap is within tolerance, 10 is not
+        assert not check_collision(base, Placement("3001", 1, (79.6, 0, 0), ident))
+        assert check_collision(base, Placement("3001", 1, (70, 0, 0), ident))
+        # Contained box collides too
+        assert check_collision(base, Placement("3003", 1, (0, 0, 0), ident))
+        assert not check_collision(base, Placement("3001", 1, (0, -28, 0), ident))
@@ -1,5 +1,7 @@
 import pytest
-from validator.connections import check_explicit_connection, build_connection_graph
+from validator.connections import check_explicit_connection, build_connection_graph, get_world_connection_points
+from validator.catalog_db import get_part
+from validator.geometry import transform_point
 from validator.scene_graph import SceneGraph
 from validator.parser import Placement
 
@@ -43,3 +45,31 @@ class TestConnectionsUnits:
         assert len(connections) >= 1
         # Should be (0, 1) sorted
         assert tuple(sorted((0, 1))) in connections
+
+    def test_world_connection_points_rotated(self):
+        # 90 degrees about Y, offset: batched transform must match transform_point
+        p = Placement("3003", 1, (10, -8, 30), (0,0,1,0,1,0,-1,0,0))
+        info = get_part("3003")
+        world = get_world_connection_points(p, info)
+        
+        assert len(world) == len(info.connection_points)
+        for cp, wp in zip(info.connection_points, world):
+            expected = transform_point(tuple(cp['pos']), p)
+            assert all(abs(a - b) < 1e-4 for a, b in zip(wp['world_pos'], expected))
+            assert wp['gender'] == cp['gender']
+
+    def test_build_connection_graph_gap(self):
+        sg = SceneGraph()
+        # Second brick floats 6 LDU above the first: no studs seat
+        sg.add_placement(Placement("3003", 1, (0, 0, 0), (1,0,0,0,1,0,0,0,1)))
+        sg.add_placement(Placement("3003", 1, (0, -30, 0), (1,0,0,0,1,0,0,0,1)))
+        
+        assert build_connection_graph(sg) == []
+
+    def test_build_connection_graph_stack(self):
+        sg = SceneGraph()
+        # Three bricks stacked: only neighbours connect
+        for y in (0, -24, -48):
+            sg.add_placement(Placement("3003", 1, (0, y, 0), (1,0,0,0,1,0,0,0,1)))
+        
+        assert build_connection_graph(sg) == [(0, 1), (1, 2)]
@@ -0,0 +1,56 @@
+import numpy as np
+from validator import geometry_kernels
+from validator.geometry_kernels import collide_pairs, world_aabb, apply_transform, PARALLEL_MIN_PAIRS
+
+def _random_boxes(n, seed=0):
+    rng = np.random.default_rng(seed)
+    mins = rng.uniform(0, 200, size=(n, 3))
+    maxs = mins + rng.uniform(1, 40, size=(n, 3))
+    return mins, maxs
+
+def _reference(mins, maxs, pair_i, pair_j, min_overlap):
+    overlap = np.minimum(maxs[pair_i], maxs[pair_j]) - np.maximum(mins[pair_i], mins[pair_j])
+    return (overlap > min_overlap).all(axis=1)
+
+class TestGeometryKernels:
+    def test_collide_pairs_matches_reference(self):
+        mins, maxs = _random_boxes(200)
+        pair_i, pair_j = np.triu_indices(200, k=1)
+        
+        hits = collide_pairs(mins, maxs, pair_i, pair_j, 4.0)
+        assert hits.any()
+        assert np.array_equal(hits, _reference(mins, maxs, pair_i, pair_j, 4.0))
+
+    def test_collide_pairs_threaded_fallback(self, monkeypatch):
+        # Large enough to be sharded across the thread pool
+        monkeypatch.setattr(geometry_kernels, "HAVE_NUMBA", False)
+        mins, maxs = _random_boxes(200, seed=1)
+        pair_i, pair_j = np.triu_indices(200, k=1)
+        assert len(pair_i) > PARALLEL_MIN_PAIRS
+        
+        hits = collide_pairs(mins, maxs, pair_i, pair_j, 4.0)
+        assert np.array_equal(hits, _reference(mins, maxs, pair_i, pair_j, 4.0))
+
+    def test_collide_pairs_empty(self):
+        mins, maxs = _random_boxes(3)
+        empty = np.empty(0, dtype=np.intp)
+        assert len(collide_pairs(mins, maxs, empty, empty, 4.0)) == 0
+
+    def test_world_aabb_matches_numpy_fallback(self, monkeypatch):
+        corners = np.array([(x, y, z) for x in (-20, 20) for y in (-24, 0) for z in (-10, 10)], dtype=np.float32)
+        rotation = np.array([[0, 0, 1], [0, 1, 0], [-1, 0, 0]], dtype=np.float32)
+        position = (10, -24.0, 5)
+        
+        compiled = world_aabb(corners, rotation, position)
+        monkeypatch.setattr(geometry_kernels, "HAVE_NUMBA", False)
+        assert world_aabb(corners, rotation, position) == compiled
+        assert compiled == ((0.0, -48.0, -15.0), (20.0, -24.0, 25.0))
+
+    def test_apply_transform_matches_matmul(self):
+        rng = np.random.default_rng(2)
+        pos = rng.uniform(-50, 50, size=(40, 3))
+        rotation = np.array([[0, 0, 1], [0, 1, 0], [-1, 0, 0]], dtype=np.float64)
+        offset = np.array([10.0, -24.0, 5.0])
+        
+        assert np.allclose(apply_transform(pos, rotation, offset), pos @ rotation.T + offset)
+        assert apply_transform(pos[:0], rotation, offset).shape == (0, 3)
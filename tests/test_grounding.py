@@ -1,5 +1,5 @@
 import pytest
-from validator.grounding import is_touching_ground, validate_grounding
+from validator.grounding import is_touching_ground, validate_grounding, ground_contact_mask
 from validator.parser import Placement
 
 class TestGroundingUnits:
@@ -33,3 +33,14 @@ class TestGroundingUnits:
         assert 3 in floating
         assert 0 not in floating
         assert 2 not in floating
+
+    def test_ground_contact_mask_matches_scalar(self):
+        placements = [
+            Placement("3001", 1, (0, -24, 0), (1,0,0,0,1,0,0,0,1)),
+            Placement("3020", 1, (0, -8, 0), (1,0,0,0,1,0,0,0,1)),
+            Placement("3001", 1, (0, -100, 0), (1,0,0,0,1,0,0,0,1)),
+            # Upside down: bottom is now the stud side
+            Placement("3001", 1, (0, 0, 0), (1,0,0,0,-1,0,0,0,-1)),
+        ]
+        mask = ground_contact_mask(placements)
+        assert list(mask) == [is_touching_ground(p) for p in placements]
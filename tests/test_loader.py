@@ -0,0 +1,42 @@
+import pytest
+from validator.loader import Loader
+from validator.scene_graph import SceneGraph
+
+class TestLoaderUnits:
+    def test_nested_submodels_flatten_in_file_order(self, tmp_path):
+        # main places "wall" twice (second copy rotated 90 deg about Y and shifted),
+        # with a loose brick in between; wall is two stacked bricks.
+        d = tmp_path / "nested.mpd"
+        d.write_text("""0 FILE main.ldr
+1 7 0 0 0 1 0 0 0 1 0 0 0 1 wall.ldr
+1 4 100 -24 0 1 0 0 0 1 0 0 0 1 3003.dat
+1 7 0 0 200 0 0 1 0 1 0 -1 0 0 wall.ldr
+0 NOFILE
+0 FILE wall.ldr
+1 1 0 -24 0 1 0 0 0 1 0 0 0 1 3001.dat
+1 2 40 -48 0 1 0 0 0 1 0 0 0 1 3001.dat
+0 NOFILE
+""")
+        sg = SceneGraph()
+        Loader(sg).load(d)
+        
+        placements = sg.placements
+        assert [p.color for p in placements] == [1, 2, 4, 1, 2]
+        assert placements[1].position == (40, -48, 0)
+        assert placements[2].position == (100, -24, 0)
+        # Rotated copy: local x=40 maps to world z=-40 (plus the 200 offset)
+        assert placements[4].position == (0, -48, 160)
+        assert placements[4].rotation == (0, 0, 1, 0, 1, 0, -1, 0, 0)
+
+    def test_recursive_submodel_rejected(self, tmp_path):
+        d = tmp_path / "loop.mpd"
+        d.write_text("""0 FILE main.ldr
+1 7 0 0 0 1 0 0 0 1 0 0 0 1 sub.ldr
+0 NOFILE
+0 FILE sub.ldr
+1 7 0 0 0 1 0 0 0 1 0 0 0 1 sub.ldr
+1 7 0 0 0 1 0 0 0 1 0 0 0 1 sub.ldr
+0 NOFILE
+""")
+        with pytest.raises(ValueError):
+            Loader(SceneGraph()).load(d)
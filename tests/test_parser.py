@@ -42,3 +42,38 @@ class TestParserUnits:
         assert "sub.ldr" in models
         assert len(models["main.ldr"].placements) == 1
         assert len(models["sub.ldr"].placements) == 1
+
+    def test_mpd_parsing_numeric_columns(self, tmp_path):
+        d = tmp_path / "cols.ldr"
+        d.write_text("""0 Untitled
+  1 4 10.5 -24 0.25 0 0 1 0 1 0 -1 0 0 3001.dat
+1\t15 0 0 0 1 0 0 0 1 0 0 0 1 Some Part.DAT
+1 4 0 0 0 1 0 0 0 1 0
+""")
+        placements = parse_mpd(d)["main"].placements
+        assert len(placements) == 2
+        assert placements[0].color == 4
+        assert placements[0].position == (10.5, -24.0, 0.25)
+        assert placements[0].rotation == (0, 0, 1, 0, 1, 0, -1, 0, 0)
+        assert placements[1].part_id == "some part"
+        assert placements[1].color == 15
+
+    def test_placements_share_rotations(self, tmp_path):
+        d = tmp_path / "shared.ldr"
+        d.write_text("""1 4 0 0 0 1 0 0 0 1 0 0 0 1 3001.dat
+1 4 40 0 0 1 0 0 0 1 0 0 0 1 3001.dat
+""")
+        first, second = parse_mpd(d)["main"].placements
+        assert first.rotation is second.rotation
+        assert not hasattr(first, "__dict__")
+
+    def test_mpd_crlf_and_empty(self, tmp_path):
+        d = tmp_path / "crlf.mpd"
+        d.write_bytes(b"0 FILE Main Model.ldr\r\n1 4 0 0 0 1 0 0 0 1 0 0 0 1 3001.dat\r\n0 NOFILE\r\n")
+        models = parse_mpd(d)
+        assert list(models) == ["main model.ldr"]
+        assert models["main model.ldr"].placements[0].part_id == "3001"
+        
+        empty = tmp_path / "empty.ldr"
+        empty.write_bytes(b"")
+        assert parse_mpd(empty)["main"].placements == []
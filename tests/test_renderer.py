@@ -4,7 +4,7 @@ import shutil
 from unittest.mock import patch, MagicMock
 from validator.scene_graph import SceneGraph
 from validator.parser import Placement
-from validator.renderer import render_scene
+from validator.renderer import render_scene, render_part, render_parts, render_single_part
 
 class TestRendererUnits:
     
@@ -47,6 +47,96 @@ class TestRendererUnits:
         ldr_file = cmd_list[1]
         assert ldr_file.endswith(".ldr")
 
+    @patch('subprocess.run')
+    @patch('shutil.which')
+    def test_render_scene_ldraw_export(self, mock_which, mock_subprocess):
+        mock_which.side_effect = lambda arg: "LDView" if arg == "LDView" else None
+        
+        # Capture the temp file before render_scene deletes it
+        written = {}
+        def read_ldr(args, **kwargs):
+            with open(args[1]) as f:
+                written["text"] = f.read()
+            return MagicMock(returncode=0)
+        mock_subprocess.side_effect = read_ldr
+        
+        sg = SceneGraph()
+        sg.add_placement(Placement("3001", 4, (0, -24, 0), (1,0,0,0,1,0,0,0,1)))
+        sg.add_placement(Placement("3003", 1, (20, -48, 10), (0,0,1,0,1,0,-1,0,0)))
+        
+        assert render_scene(sg, "out.png")
+        assert written["text"].splitlines() == [
+            "0 MOC Render",
+            "1 4 0 -24 0 1 0 0 0 1 0 0 0 1 3001.dat",
+            "1 1 20 -48 10 0 0 1 0 1 0 -1 0 0 3003.dat",
+        ]
+
+    @patch('subprocess.run')
+    @patch('shutil.which')
+    def test_render_part_matches_single_placement_scene(self, mock_which, mock_subprocess):
+        mock_which.side_effect = lambda arg: "LDView" if arg == "LDView" else None
+        
+        written = []
+        def read_ldr(args, **kwargs):
+            with open(args[1]) as f:
+                written.append((f.read(), args[2:]))
+            return MagicMock(returncode=0)
+        mock_subprocess.side_effect = read_ldr
+        
+        sg = SceneGraph()
+        sg.add_placement(Placement("3001", 16, (0.0, 0.0, 0.0), (1.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 1.0)))
+        
+        assert render_scene(sg, "out.png", width=400, height=400)
+        assert render_part("3001", "out.png", width=400, height=400)
+        assert written[0] == written[1]
+
+    @patch('subprocess.run')
+    @patch('shutil.which')
+    def test_render_single_part_passes_library_file(self, mock_which, mock_subprocess, tmp_path):
+        mock_which.side_effect = lambda arg: "LDView" if arg == "LDView" else None
+        mock_subprocess.return_value = MagicMock(returncode=0)
+        (tmp_path / "parts").mkdir()
+        (tmp_path / "parts" / "3001.dat").write_text("0 Brick 2 x 4\n")
+        
+        with patch('validator.config.LDRAW_PATH', tmp_path):
+            assert render_single_part("3001", "out.png", width=400, height=400)
+            cmd_list = mock_subprocess.call_args[0][0]
+            assert cmd_list[1] == str(tmp_path / "parts" / "3001.dat")
+            assert "-SaveSnapshot=out.png" in cmd_list
+            
+            # Not in parts/: falls back to a generated model file
+            assert render_single_part("4-4cyli", "out.png")
+            assert mock_subprocess.call_args[0][0][1].endswith(".ldr")
+
+    @patch('subprocess.run')
+    @patch('shutil.which')
+    def test_render_parts_uses_one_ldview_call(self, mock_which, mock_subprocess, tmp_path):
+        mock_which.side_effect = lambda arg: "LDView" if arg == "LDView" else None
+        
+        # Fake LDView batch mode: one snapshot per model file, skipping 3003
+        def snapshot_all(args, **kwargs):
+            save_dir = next(a for a in args if a.startswith("-SaveDir=")).split("=", 1)[1]
+            for ldr in (a for a in args if a.endswith(".ldr")):
+                with open(ldr) as f:
+                    if "3003.dat" in f.read():
+                        continue
+                png = os.path.join(save_dir, os.path.basename(ldr)[:-4] + ".png")
+                with open(png, "wb") as f:
+                    f.write(b"png")
+            return MagicMock(returncode=0)
+        mock_subprocess.side_effect = snapshot_all
+        
+        results = render_parts(["3001", "3003", "3069b"], str(tmp_path), width=400, height=400)
+        
+        assert mock_subprocess.call_count == 1
+        assert "-SaveSnapshots=1" in mock_subprocess.call_args[0][0]
+        assert results == {"3001": True, "3003": False, "3069b": True}
+        assert sorted(os.listdir(tmp_path)) == ["3001.png", "3069b.png"]
+        
+        # Subfolder ids land in a matching subdirectory
+        assert render_parts(["s/3001s01"], str(tmp_path)) == {"s/3001s01": True}
+        assert (tmp_path / "s" / "3001s01.png").exists()
+
     @patch('subprocess.run')
     @patch('shutil.which')
     def test_render_failure_handling(self, mock_which, mock_subprocess):
@@ -1,4 +1,5 @@
 import pytest
+import numpy as np
 from validator.scene_graph import SceneGraph
 from validator.parser import Placement
 
@@ -25,3 +26,32 @@ class TestSceneGraphUnits:
         # Box from -10 to 10
         results = sg.query_box((-10,-10,-10), (10,10,10))
         assert id1 in results
+        
+        # Touching counts: the brick's top face is at y=0
+        assert sg.query_box((-10, 0, -10), (10, 5, 10)) == [id1]
+        mins, maxs = sg.aabb_arrays()
+        assert mins.dtype == maxs.dtype == np.float32
+
+    def test_finalize_world_studs(self):
+        sg = SceneGraph()
+        p1 = Placement("3001", 1, (0, 0, 0), (1,0,0,0,1,0,0,0,1))
+        p2 = Placement("3001", 1, (20, -24, 0), (1,0,0,0,1,0,0,0,1))
+        sg.add_placement(p1)
+        id2 = sg.add_placement(p2)
+        sg.finalize()
+        
+        studs = sg.world_studs_of(id2)
+        assert studs.shape == (8, 3)
+        assert studs.dtype == np.float32
+        # Studs shifted by the placement position
+        assert all(abs(s[1] + 24) < 0.1 for s in studs)
+        assert list(sg.stud_owner).count(id2) == 8
+
+    def test_world_aabb_rotated_and_cached(self):
+        from validator.geometry import get_world_aabb
+        # 90 degrees about Y swaps the X and Z extents of a 2x4 brick
+        p = Placement("3001", 1, (0, 0, 0), (0,0,1,0,1,0,-1,0,0))
+        (min_x, _, min_z), (max_x, _, max_z) = get_world_aabb(p)
+        assert abs((max_x - min_x) - 40) < 0.1
+        assert abs((max_z - min_z) - 80) < 0.1
+        assert get_world_aabb(p) is get_world_aabb(p)
@@ -1,6 +1,10 @@
+import os
+import sys
+import numpy as np
 import pytest
 from pathlib import Path
-from validator.shadow_parser import ShadowParser
+from validator import shadow_parser
+from validator.shadow_parser import ShadowParser, PRELOAD_MIN_FILES, _grid_offsets, shared_parser
 
 # Mock Shadow Lib structure
 @pytest.fixture
@@ -25,7 +29,143 @@ def test_parse_part(shadow_lib):
     assert points[0]['type'] == 'SNAP_CYL'
     assert points[0]['gender'] == 'F'
 
-def test_parse_missing_part(shadow_lib):
+def test_parse_missing_part(shadow_lib, caplog):
     parser = ShadowParser(str(shadow_lib))
     points = parser.parse_part("parts/missing.dat")
     assert len(points) == 0
+    assert "Could not find shadow file: parts/missing.dat" in caplog.text
+
+def test_parse_part_snap_lines(shadow_lib):
+    with open(shadow_lib / "parts" / "3001.dat", "w") as f:
+        f.write("0 !LDCAD GROUP_DEF [id=0]\n")
+        f.write("1 16 0 0 0 1 0 0 0 1 0 0 0 1 3001s01.dat\n")
+        f.write("0 !LDCAD SNAP_CYL [gender=M] [pos=10 -4 0] [secs=R 6 4]\n")
+        f.write("0 !LDCAD SNAP_FGR[gender=F] [pos=0 0 0]\n")
+    
+    points = ShadowParser(str(shadow_lib)).parse_part("parts/3001.dat")
+    assert [(p['type'], p['gender']) for p in points] == [('SNAP_CYL', 'M'), ('SNAP_FGR', 'F')]
+    assert points[0]['pos'] == [10.0, -4.0, 0.0]
+    assert points[0]['properties']['secs'] == 'R 6 4'
+
+def test_resolve_uses_file_index(shadow_lib, monkeypatch):
+    parser = ShadowParser(str(shadow_lib))
+    monkeypatch.setattr(os.path, "exists", lambda path: pytest.fail("resolve should not stat"))
+    
+    # Found under parts/, case-insensitively and with either separator
+    expected = os.path.join(str(shadow_lib), "parts", "3003.dat")
+    assert parser._resolve("3003.dat") == expected
+    assert parser._resolve("PARTS\\3003.DAT") == expected
+    assert parser._resolve("missing.dat") is None
+    assert "missing.dat" in parser._path_cache
+
+def test_shared_parser_walks_library_once(shadow_lib, monkeypatch):
+    with open(shadow_lib / "parts" / "3001.dat", "w") as f:
+        f.write("0 !LDCAD SNAP_CYL [gender=M] [pos=0 0 0]\n")
+    
+    walks = []
+    real_walk = os.walk
+    monkeypatch.setattr(shadow_parser.os, "walk", lambda top: walks.append(top) or real_walk(top))
+    monkeypatch.setattr(shadow_parser, "_worker_parsers", {})
+    
+    # build_catalog's process_part looks each part up through shared_parser
+    for part in ("parts/3003.dat", "parts/3001.dat"):
+        assert len(shared_parser(str(shadow_lib)).parse_part(part)) == 1
+    assert walks == [str(shadow_lib)]
+
+def test_snap_incl_transformed_once(shadow_lib):
+    with open(shadow_lib / "p" / "stud.dat", "w") as f:
+        f.write("0 !LDCAD SNAP_CYL [gender=M] [pos=0 0 0]\n")
+    with open(shadow_lib / "parts" / "3005.dat", "w") as f:
+        f.write("0 !LDCAD SNAP_INCL [ref=stud.dat] [pos=0 -4 0]\n")
+    with open(shadow_lib / "parts" / "3004.dat", "w") as f:
+        f.write("0 !LDCAD SNAP_INCL [ref=stud.dat] [pos=0 -4 0]\n")
+        f.write("0 !LDCAD SNAP_INCL [ref=stud.dat] [pos=20 -4 0]\n")
+    
+    parser = ShadowParser(str(shadow_lib))
+    one = parser.parse_part("parts/3005.dat")
+    two = parser.parse_part("parts/3004.dat")
+    assert [p['pos'] for p in two] == [[0.0, -4.0, 0.0], [20.0, -4.0, 0.0]]
+    # Same ref at the same pos/ori reuses the transformed points
+    assert len(parser._incl_cache) == 2
+
+def test_parse_part_soa_grid(shadow_lib):
+    with open(shadow_lib / "parts" / "3001.dat", "w") as f:
+        f.write("0 !LDCAD SNAP_CYL [gender=M] [pos=0 -4 0] [grid=C 4 C 2 20 20]\n")
+        f.write("0 !LDCAD SNAP_INCL [ref=parts/3003.dat] [pos=10 0 0] [ori=0 0 1 0 1 0 -1 0 0]\n")
+    
+    parser = ShadowParser(str(shadow_lib))
+    soa = parser.parse_part_soa("parts/3001.dat")
+    assert soa['types'] == ['SNAP_CYL'] * 8 + ['SNAP_CYL']
+    assert soa['genders'].tolist() == [1] * 8 + [2]
+    assert soa['pos'].shape == (9, 3) and soa['ori'].shape == (9, 3, 3)
+    # X outer, Z inner, centered on the base position
+    assert soa['pos'][:3].tolist() == [[-30, -4, -10], [-30, -4, 10], [-10, -4, -10]]
+    assert soa['pos'][8].tolist() == [10, 0, 0]
+    
+    arr = parser.parse_part_array("parts/3001.dat")
+    assert arr['type'][0] == b'SNAP_CYL' and arr['gender'][8] == b'F'
+    assert np.array_equal(arr['pos'], soa['pos'])
+    
+    points = parser.parse_part("parts/3001.dat")
+    assert points[0] == {
+        'type': 'SNAP_CYL', 'gender': 'M', 'role': 'unknown',
+        'properties': {'gender': 'M', 'pos': '0 -4 0', 'grid': 'C 4 C 2 20 20'},
+        'pos': [-30.0, -4.0, -10.0], 'ori': [1.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 1.0],
+    }
+
+def test_parse_part_binary_scan(shadow_lib):
+    with open(shadow_lib / "parts" / "3002.dat", "wb") as f:
+        f.write(b"0 Brick 2 x 3 \xe9\xff not utf-8\r\n")
+        f.write(b"  \t0 !LDCAD SNAP_CYL [gender=M] [pos=0 -4 0]\r\n")
+        f.write(b"0 !LDCAD SNAP_GEN [gender=F] [id=caf\xc3\xa9]\r\n")
+    
+    points = ShadowParser(str(shadow_lib)).parse_part("parts/3002.dat")
+    assert [p['type'] for p in points] == ['SNAP_CYL', 'SNAP_GEN']
+    assert points[1]['role'] == 'caf\u00e9'
+
+def test_parse_properties(shadow_lib):
+    parser = ShadowParser(str(shadow_lib))
+    props = parser._parse_properties("[gender=M] [pos=0 -4 0 ] junk [bad key=1] [empty=] [grid=C 2 C 4 20 20]")
+    assert props == {'gender': 'M', 'pos': '0 -4 0', 'grid': 'C 2 C 4 20 20'}
+    # Keys and common values are shared strings
+    key = next(iter(props))
+    assert key is sys.intern('gender') and props[key] is sys.intern('M')
+
+def test_parse_vector_cached_tuples(shadow_lib):
+    parser = ShadowParser(str(shadow_lib))
+    assert parser._parse_vector('0 0 0') == (0.0, 0.0, 0.0)
+    assert parser._parse_matrix('1 0 0 0 1 0 0 0 1') == (1.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 1.0)
+    assert parser._parse_vector('10 -4 0.5') is parser._parse_vector('10 -4 0.5')
+
+def test_grid_offsets_cached():
+    offsets = _grid_offsets('C 2 1 20 0')
+    assert offsets.tolist() == [[-10.0, 0.0, 0.0], [10.0, 0.0, 0.0]]
+    assert _grid_offsets('C 2 1 20 0') is offsets
+    assert not offsets.flags.writeable
+    assert _grid_offsets('R 2 2') is None
+
+def test_preload_matches_parse_part(shadow_lib):
+    names = []
+    for k in range(PRELOAD_MIN_FILES):
+        with open(shadow_lib / "parts" / f"preload{k}.dat", "w") as f:
+            f.write(f"0 !LDCAD SNAP_CYL [gender=M] [pos={k} -4 0] [grid=C 2 1 20 0]\n")
+            f.write("0 !LDCAD SNAP_INCL [ref=parts/3003.dat] [pos=0 24 0]\n")
+        names.append(f"parts/preload{k}.dat")
+    names.append("parts/missing.dat")
+    
+    parser = ShadowParser(str(shadow_lib))
+    parser.preload(names, max_workers=2)
+    assert "parts/missing.dat" not in parser._soa_cache
+    
+    fresh = ShadowParser(str(shadow_lib))
+    for name in names:
+        assert parser.parse_part(name) == fresh.parse_part(name)
+
+def test_parse_part_skips_malformed_vectors(shadow_lib):
+    with open(shadow_lib / "parts" / "bad.dat", "w") as f:
+        f.write("0 !LDCAD SNAP_CYL [gender=M] [pos=0 0]\n")
+        f.write("0 !LDCAD SNAP_CYL [gender=F] [pos=0 -4 0]\n")
+        f.write("0 !LDCAD SNAP_INCL [ref=parts/3003.dat] [ori=1 0 0]\n")
+    
+    points = ShadowParser(str(shadow_lib)).parse_part("parts/bad.dat")
+    assert [p['gender'] for p in points] == ['F']
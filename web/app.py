@@ -4,23 +4,105 @@ Flask web app for browsing the LDraw part catalog.
 
 from flask import Flask, render_template, jsonify, send_file, request, g, Response
 from pathlib import Path
+from functools import lru_cache, wraps
+from typing import Optional
+from werkzeug.wsgi import FileWrapper
+import gzip
+import hashlib
+import os
+import sqlite3
 import sys
 import json
+import queue
+import re
 import threading
-import time
 import uuid
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
+from itertools import islice
+
+try:
+    import orjson
+except ImportError:  # optional; falls back to the stdlib encoder
+    orjson = None
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+RENDERED_DIR = PROJECT_ROOT / "data" / "rendered_images"
+PLACEHOLDER_PATH = Path(__file__).resolve().parent / "static" / "placeholder.png"
 
 # Add src to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from validator.catalog_db import DB_PATH, init_db, load_part, get_stats
+from validator.config import LDRAW_PATH, get_parts_dir
+from validator.renderer import render_parts, render_single_part
+
+PARTS_DIR = get_parts_dir()
+RENDERED_DIR.mkdir(parents=True, exist_ok=True)
 
-from validator.catalog_db import init_db, load_part, get_stats
+# Part ids with a PNG in RENDERED_DIR. Scanned once; every render path in this
+# module adds to it, so api_image needs no stat to find rendered images.
+RENDERED_INDEX = {name[:-4] for name in os.listdir(RENDERED_DIR) if name.endswith('.png')}
 
 app = Flask(__name__)
 
+
+def dumps(obj) -> str:
+    """Serialize to JSON text, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+
 # Batch job management
 batch_jobs = {}  # job_id -> job_info
 batch_lock = threading.Lock()
+# Notified (under batch_lock) whenever a job's "version" is bumped. Each status
+# stream compares against the version it last sent, so no stream can consume
+# another's wake-up.
+batch_changed = threading.Condition(batch_lock)
+batch_queue = queue.Queue()  # pending render_batch callables, run in order
+_batch_worker = None
+
+BATCH_LOG_LINES = 2000  # per-job log ring buffer; older lines are dropped
+HISTORY_LOG_LINES = 200  # log tail included per job in /api/batch/jobs
+
+
+def append_job_log(job_info, line):
+    """Append to a job's bounded log, counting every line ever written."""
+    with batch_lock:
+        job_info["log"].append(line)
+        job_info["log_total"] += 1
+
+
+def notify_job(job_info):
+    """Mark a job as changed and wake every status stream."""
+    with batch_lock:
+        job_info["version"] += 1
+        batch_changed.notify_all()
+
+
+def _run_batch_worker():
+    """Run queued batch jobs one at a time so LDView load stays bounded."""
+    while True:
+        job = batch_queue.get()
+        try:
+            job()
+        except Exception:
+            app.logger.exception("Batch job failed")
+        finally:
+            batch_queue.task_done()
+
+
+def submit_batch_job(job):
+    """Queue a batch job, starting the worker thread on first use."""
+    global _batch_worker
+    with batch_lock:
+        if _batch_worker is None or not _batch_worker.is_alive():
+            _batch_worker = threading.Thread(target=_run_batch_worker, name="batch-render", daemon=True)
+            _batch_worker.start()
+    batch_queue.put(job)
 
 
 def get_db():
@@ -30,6 +112,24 @@ def get_db():
     return g.db
 
 
+# Create/migrate the schema once at startup, so read-only connections always find it
+init_db().close()
+
+_read_local = threading.local()
+
+
+def get_read_db():
+    """Read-only connection for lookup-only endpoints, reused per thread.
+    
+    Skips init_db's schema/migration pass, which get_db pays on every request.
+    """
+    conn = getattr(_read_local, 'conn', None)
+    if conn is None:
+        conn = sqlite3.connect(f"{DB_PATH.as_uri()}?mode=ro", uri=True)
+        _read_local.conn = conn
+    return conn
+
+
 @app.teardown_appcontext
 def close_db(error):
     """Close database connection at end of request."""
@@ -38,6 +138,73 @@ def close_db(error):
         db.close()
 
 
+# Cached JSON bodies for the aggregate endpoints: endpoint -> (catalog token, body)
+_response_cache = {}
+_response_cache_lock = threading.Lock()
+
+
+def _catalog_token(conn):
+    """Cheap fingerprint of the parts table; changes whenever rows or images change."""
+    return tuple(conn.execute("SELECT COUNT(*), MAX(rowid), SUM(has_image) FROM parts").fetchone())
+
+
+def cached_on_catalog(view):
+    """Serve a view's JSON body from memory until the catalog token changes."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        token = _catalog_token(get_db())
+        with _response_cache_lock:
+            cached = _response_cache.get(view.__name__)
+        if cached and cached[0] == token:
+            return Response(cached[1], mimetype='application/json')
+        
+        response = view(*args, **kwargs)
+        if response.status_code == 200:
+            with _response_cache_lock:
+                _response_cache[view.__name__] = (token, response.get_data())
+        return response
+    return wrapper
+
+
+def invalidate_response_cache():
+    """Drop cached aggregate responses after the catalog is written to."""
+    with _response_cache_lock:
+        _response_cache.clear()
+
+
+def _in_clause(col, values, universe=None, null_value=None):
+    """
+    Build a (sql, params) filter matching `col` against `values`.
+    
+    Selecting every value in `universe` collapses to "1=1" so no tautological
+    OR chain reaches the planner; an empty selection is "1=0". `null_value`
+    is the UI label that stands for NULL in the column.
+    """
+    values = list(dict.fromkeys(values))
+    if not values:
+        return "1=0", []
+    if universe is not None and set(values) >= set(universe):
+        return "1=1", []
+    
+    conditions = []
+    real_values = [v for v in values if v != null_value]
+    if real_values:
+        conditions.append(f"{col} IN ({','.join('?' * len(real_values))})")
+    if null_value is not None and null_value in values:
+        conditions.append(f"{col} IS NULL")
+    
+    sql = conditions[0] if len(conditions) == 1 else f"({' OR '.join(conditions)})"
+    return sql, real_values
+
+
+def _split_list(value):
+    """Split a comma-separated query value into stripped items."""
+    return [v.strip() for v in value.split(',')]
+
+
+_IMAGE_FLAGS = {'yes': 1, 'no': 0}
+
+
 @app.route('/')
 def index():
     """Serve the main catalog viewer page."""
@@ -57,9 +224,39 @@ def batch_page():
 
 
 # LDraw library file routes for 3D viewer
-def get_ldraw_file(filename):
-    """Centralized helper to find LDraw files in various directories."""
-    from validator.config import LDRAW_PATH
+_ldraw_index = None  # lowercased path relative to LDRAW_PATH -> absolute path
+_ldraw_index_lock = threading.Lock()
+
+
+def _get_ldraw_index():
+    """Walk the LDraw library once and index every file by its relative path."""
+    global _ldraw_index
+    if _ldraw_index is None:
+        with _ldraw_index_lock:
+            if _ldraw_index is None:
+                index = {}
+                pending = [(str(LDRAW_PATH), '')]
+                while pending:
+                    dir_path, rel = pending.pop()
+                    try:
+                        entries = list(os.scandir(dir_path))
+                    except OSError:
+                        continue
+                    for entry in entries:
+                        key = rel + entry.name.lower()
+                        if entry.is_dir():
+                            pending.append((entry.path, key + '/'))
+                        else:
+                            index[key] = entry.path
+                _ldraw_index = index
+    return _ldraw_index
+
+
+@lru_cache(maxsize=8192)
+def _resolve_ldraw_file(filename: str) -> Optional[str]:
+    """Resolve a requested LDraw filename to a library path (cached; the library is static)."""
+    index = _get_ldraw_index()
+    filename = filename.replace('\\', '/').lower()
     
     # Strip any redundant 'parts/', 'p/', or 'models/' prefixes from the filename
     # Some loaders (like Three.js LDrawLoader) might concatenate these
@@ -68,34 +265,85 @@ def get_ldraw_file(filename):
         if clean_name.startswith(prefix):
             clean_name = clean_name[len(prefix):]
             
-    # Try multiple search locations
-    search_dirs = ['parts', 'p', 'models', ''] # '' for root
-    for subdir in search_dirs:
-        if subdir:
-            file_path = LDRAW_PATH / subdir / clean_name
-        else:
-            file_path = LDRAW_PATH / clean_name
-            
-        if file_path.exists():
-            return file_path
-            
-    # Also try with the original name just in case
-    for subdir in search_dirs:
-        if subdir:
-            file_path = LDRAW_PATH / subdir / filename
-        else:
-            file_path = LDRAW_PATH / filename
-        if file_path.exists():
-            return file_path
+    # Try multiple search locations, then the original name just in case
+    search_dirs = ['parts/', 'p/', 'models/', ''] # '' for root
+    for name in (clean_name, filename):
+        for subdir in search_dirs:
+            file_path = index.get(subdir + name)
+            if file_path:
+                return file_path
             
     return None
 
+
+def get_ldraw_file(filename):
+    """Centralized helper to find LDraw files in various directories.
+    
+    Returns the path as a plain str (or None); the file routes only open it,
+    so no Path object is built per request.
+    """
+    return _resolve_ldraw_file(filename)
+
+
+# Pre-compressed copies of LDraw files, built on first gzip-capable request
+GZIP_CACHE_DIR = PROJECT_ROOT / "data" / "ldraw_gz"
+GZIP_MIN_SIZE = 1024  # smaller files barely shrink; not worth the extra open
+
+
+def _gzip_variant(file_path, source_stat) -> Optional[str]:
+    """Return the cached .gz copy of file_path, rebuilding it if older than the source."""
+    gz_path = os.path.join(GZIP_CACHE_DIR, hashlib.sha1(os.fsencode(file_path)).hexdigest() + '.gz')
+    try:
+        if os.stat(gz_path).st_mtime_ns >= source_stat.st_mtime_ns:
+            return gz_path
+    except FileNotFoundError:
+        pass
+    
+    try:
+        os.makedirs(GZIP_CACHE_DIR, exist_ok=True)
+        with open(file_path, 'rb') as f:
+            data = gzip.compress(f.read(), compresslevel=6, mtime=0)
+        # Write then rename so concurrent requests never see a partial file
+        tmp_path = f"{gz_path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, gz_path)
+    except OSError:
+        return None
+    return gz_path
+
+
+def send_ldraw_file(file_path):
+    """Stream an LDraw file through the server's wsgi.file_wrapper.
+
+    Skips send_file's conditional/Range handling, which the 3D viewer never
+    uses, so servers that support it can hand the file to sendfile(2).
+    Clients accepting gzip get a cached pre-compressed copy instead.
+    """
+    body_path, encoding = file_path, None
+    if request.accept_encodings['gzip']:
+        source_stat = os.stat(file_path)
+        if source_stat.st_size >= GZIP_MIN_SIZE:
+            gz_path = _gzip_variant(file_path, source_stat)
+            if gz_path:
+                body_path, encoding = gz_path, 'gzip'
+    
+    fh = open(body_path, 'rb')
+    size = os.fstat(fh.fileno()).st_size
+    wrapper = request.environ.get('wsgi.file_wrapper', FileWrapper)
+    response = Response(wrapper(fh, 65536), mimetype='text/plain', direct_passthrough=True)
+    response.content_length = size
+    if encoding:
+        response.content_encoding = encoding
+    response.vary.add('Accept-Encoding')
+    return response
+
 @app.route('/parts/<path:filename>')
 def serve_ldraw_parts(filename):
     """Serve LDraw parts files for 3D viewer."""
     file_path = get_ldraw_file(filename)
     if file_path:
-        return send_file(file_path, mimetype='text/plain')
+        return send_ldraw_file(file_path)
     return "Not found", 404
 
 @app.route('/p/<path:filename>')
@@ -103,7 +351,7 @@ def serve_ldraw_primitives(filename):
     """Serve LDraw primitive files for 3D viewer."""
     file_path = get_ldraw_file(filename)
     if file_path:
-        return send_file(file_path, mimetype='text/plain')
+        return send_ldraw_file(file_path)
     return "Not found", 404
 
 @app.route('/models/<path:filename>')
@@ -111,28 +359,32 @@ def serve_ldraw_models(filename):
     """Serve LDraw model files for 3D viewer."""
     file_path = get_ldraw_file(filename)
     if file_path:
-        return send_file(file_path, mimetype='text/plain')
+        return send_ldraw_file(file_path)
     return "Not found", 404
 
+_ROOT_EXTENSIONS = ('.dat', '.ldr')
+# Material file requests, served from whichever of these library files exists (in order)
+_MATERIAL_FILES = ('ldconfig.ldr', 'colors/ldcfg.ldr')
+
+
 @app.route('/<path:filename>')
 def serve_ldraw_root(filename):
     """Serve LDraw files from root path."""
     # Allow .dat and .ldr files
-    ext = filename.split('.')[-1].lower() if '.' in filename else ''
-    if ext not in ['dat', 'ldr']:
+    name = filename.lower()
+    if not name.endswith(_ROOT_EXTENSIONS):
         return "Not found", 404
         
     # Handle common material file paths explicitly
-    from validator.config import LDRAW_PATH
-    if filename.lower() in ['ldconfig.ldr', 'colors/ldcfg.ldr']:
-        targets = [LDRAW_PATH / "LDConfig.ldr", LDRAW_PATH / "colors" / "ldcfg.ldr"]
-        for target in targets:
-            if target.exists():
-                return send_file(target, mimetype='text/plain')
+    if name in _MATERIAL_FILES:
+        index = _get_ldraw_index()
+        for key in _MATERIAL_FILES:
+            if key in index:
+                return send_ldraw_file(index[key])
 
     file_path = get_ldraw_file(filename)
     if file_path:
-        return send_file(file_path, mimetype='text/plain')
+        return send_ldraw_file(file_path)
             
     return "Not found", 404
 
@@ -140,10 +392,6 @@ def serve_ldraw_root(filename):
 @app.route('/api/batch/start', methods=['POST'])
 def api_batch_start():
     """Start a batch rendering job in the background."""
-    from validator.scene_graph import SceneGraph
-    from validator.parser import Placement
-    from validator.renderer import render_scene
-    
     data = request.get_json()
     categories = data.get('categories', '')
     images = data.get('images', '')
@@ -151,70 +399,60 @@ def api_batch_start():
     limit = int(data.get('limit', 100))
     
     # Get matching parts
-    conn = init_db()
+    conn = get_db()
     where_clauses = []
     params = []
     
     types = data.get('types', '')
     
-    # Handle categories (comma-separated)
-    if categories:
-        category_list = [c.strip() for c in categories.split(',')]
-        if 'all' not in category_list:
-            placeholders = ','.join(['?' for _ in category_list])
-            where_clauses.append(f"category IN ({placeholders})")
-            params.extend(category_list)
+    def add_filter(sql, filter_params):
+        if sql != "1=1":
+            where_clauses.append(sql)
+            params.extend(filter_params)
+    
+    # Handle categories, ldraw_org and extractions (comma-separated, 'all' = no filter)
+    for col, raw in (("category", categories),
+                     ("ldraw_org", data.get('ldraw_orgs', '')),
+                     ("extraction_status", extractions)):
+        if raw:
+            values = _split_list(raw)
+            if 'all' not in values:
+                add_filter(*_in_clause(col, values))
             
     # Handle types (comma-separated)
     if types:
-        type_list = [t.strip() for t in types.split(',')]
+        type_list = _split_list(types)
         if 'all' not in type_list:
             standard_types = ['Brick', 'Plate', 'Tile', 'Slope', 'Technic', 'Minifig', 'Vehicle', 'Building', 'Electric', 'Sticker', 'Specialized', 'Obsolete']
             
             has_other = 'Other' in type_list
             selected_standard = [t for t in type_list if t in standard_types]
             
-            type_conditions = []
-            if selected_standard:
-                placeholders = ','.join(['?' for _ in selected_standard])
-                type_conditions.append(f"type IN ({placeholders})")
-                params.extend(selected_standard)
-                
-            if has_other:
-                placeholders = ','.join(['?' for _ in standard_types])
-                type_conditions.append(f"type NOT IN ({placeholders}) OR type IS NULL")
-                params.extend(standard_types)
-                
-            if type_conditions:
-                where_clauses.append(f"({' OR '.join(type_conditions)})")
-    
-    # Handle ldraw_org (comma-separated)
-    ldraw_orgs = data.get('ldraw_orgs', '')
-    if ldraw_orgs:
-        org_list = [o.strip() for o in ldraw_orgs.split(',')]
-        if 'all' not in org_list:
-            where_clauses.append(f"ldraw_org IN ({placeholders})")
-            params.extend(org_list)
+            if has_other and len(set(selected_standard)) == len(standard_types):
+                pass  # every type selected
+            else:
+                type_conditions = []
+                type_params = []
+                if selected_standard:
+                    sql, in_params = _in_clause("type", selected_standard)
+                    type_conditions.append(sql)
+                    type_params.extend(in_params)
+                    
+                if has_other:
+                    placeholders = ','.join('?' * len(standard_types))
+                    type_conditions.append(f"type NOT IN ({placeholders}) OR type IS NULL")
+                    type_params.extend(standard_types)
+                    
+                if type_conditions:
+                    add_filter(f"({' OR '.join(type_conditions)})", type_params)
     
     # Handle images (comma-separated: yes, no)
     if images:
-        image_list = [i.strip() for i in images.split(',')]
+        image_list = _split_list(images)
         if 'all' not in image_list:
-            image_conditions = []
-            if 'yes' in image_list:
-                image_conditions.append("has_image = 1")
-            if 'no' in image_list:
-                image_conditions.append("has_image = 0")
-            if image_conditions:
-                where_clauses.append(f"({' OR '.join(image_conditions)})")
-    
-    # Handle extractions (comma-separated)
-    if extractions:
-        extraction_list = [e.strip() for e in extractions.split(',')]
-        if 'all' not in extraction_list:
-            placeholders = ','.join(['?' for _ in extraction_list])
-            where_clauses.append(f"extraction_status IN ({placeholders})")
-            params.extend(extraction_list)
+            flags = [_IMAGE_FLAGS[i] for i in image_list if i in _IMAGE_FLAGS]
+            if flags:
+                add_filter(*_in_clause("has_image", flags, universe=_IMAGE_FLAGS.values()))
     
     where_sql = " AND ".join(where_clauses) if where_clauses else "1=1"
     
@@ -224,7 +462,6 @@ def api_batch_start():
         LIMIT ?
     """, params + [limit])
     part_ids = [row[0] for row in cursor.fetchall()]
-    conn.close()
     
     if not part_ids:
         return jsonify({"error": "No parts found matching filters"}), 400
@@ -233,13 +470,15 @@ def api_batch_start():
     job_id = str(uuid.uuid4())
     job_info = {
         "id": job_id,
-        "status": "running",
+        "status": "queued",
         "total": len(part_ids),
         "completed": 0,
         "success": 0,
         "failed": 0,
         "current": None,
-        "log": [],
+        "log": deque(maxlen=BATCH_LOG_LINES),
+        "log_total": 0,
+        "version": 0,
         "started": datetime.now().isoformat(),
         "finished": None,
         "filters": f"categories:{categories}, images:{images}, extractions:{extractions}",
@@ -251,57 +490,69 @@ def api_batch_start():
     
     # Start rendering thread
     def render_batch():
-        # Output to data/rendered_images instead of web/static/rendered
-        project_root = Path(__file__).parent.parent
-        output_dir = project_root / "data" / "rendered_images"
-        output_dir.mkdir(parents=True, exist_ok=True)
+        job_info["status"] = "running"
+        notify_job(job_info)
         
-        for i, part_id in enumerate(part_ids):
-            if job_info["stopped"]:
-                job_info["log"].append(f"--- STOPPED BY USER ---")
-                break
-            
-            job_info["current"] = part_id
-            job_info["completed"] = i + 1
-            
-            try:
-                sg = SceneGraph()
-                sg.add_placement(Placement(
-                    part_id=part_id,
-                    color=16,
-                    position=(0.0, 0.0, 0.0),
-                    rotation=(1.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 1.0)
-                ))
+        # One connection for the whole job; image updates are written in batches
+        conn = init_db()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        pending = []
+        
+        def flush_pending():
+            if pending:
+                conn.executemany(
+                    "UPDATE parts SET has_image = 1, image_path = ? WHERE part_id = ?",
+                    pending
+                )
+                conn.commit()
+                pending.clear()
+        
+        try:
+            for i, part_id in enumerate(part_ids):
+                if job_info["stopped"]:
+                    append_job_log(job_info, f"--- STOPPED BY USER ---")
+                    break
                 
-                output_path = output_dir / f"{part_id}.png"
-                success = render_scene(sg, str(output_path), silent_errors=True)
+                job_info["current"] = part_id
+                job_info["completed"] = i + 1
+                notify_job(job_info)
                 
-                if success and output_path.exists():
-                    # Update database with relative path from project root
-                    conn = init_db()
-                    rel_path = f"data/rendered_images/{part_id}.png"
-                    conn.execute(
-                        "UPDATE parts SET has_image = 1, image_path = ? WHERE part_id = ?",
-                        (rel_path, part_id)
-                    )
-                    conn.commit()
-                    conn.close()
+                try:
+                    output_path = RENDERED_DIR / f"{part_id}.png"
+                    success = RENDER_POOL.submit(
+                        render_single_part, part_id, str(output_path), silent_errors=True
+                    ).result()
                     
-                    job_info["success"] += 1
-                    job_info["log"].append(f"✓ {part_id}")
-                else:
+                    if success and output_path.exists():
+                        RENDERED_INDEX.add(part_id)
+                        # Update database with relative path from project root
+                        rel_path = f"data/rendered_images/{part_id}.png"
+                        pending.append((rel_path, part_id))
+                        if len(pending) >= 32:
+                            flush_pending()
+                        
+                        job_info["success"] += 1
+                        append_job_log(job_info, f"✓ {part_id}")
+                    else:
+                        job_info["failed"] += 1
+                        append_job_log(job_info, f"✗ {part_id}: render failed")
+                except Exception as e:
                     job_info["failed"] += 1
-                    job_info["log"].append(f"✗ {part_id}: render failed")
-            except Exception as e:
-                job_info["failed"] += 1
-                job_info["log"].append(f"✗ {part_id}: {str(e)}")
+                    append_job_log(job_info, f"✗ {part_id}: {str(e)}")
+                notify_job(job_info)
+            
+            flush_pending()
+        finally:
+            conn.close()
         
+        invalidate_response_cache()
         job_info["status"] = "completed"
         job_info["finished"] = datetime.now().isoformat()
-        job_info["log"].append(f"--- COMPLETE: {job_info['success']}/{job_info['total']} rendered ---")
+        append_job_log(job_info, f"--- COMPLETE: {job_info['success']}/{job_info['total']} rendered ---")
+        notify_job(job_info)
     
-    thread = threading.Thread(target=render_batch, daemon=True)
-    thread.start()
+    submit_batch_job(render_batch)
     
     return jsonify({"job_id": job_id, "total": len(part_ids)})
 
@@ -310,42 +561,74 @@ def api_batch_start():
 def api_batch_status(job_id):
     """Stream batch job progress via Server-Sent Events."""
     def generate():
-        last_log_index = 0
+        seen_log_lines = 0
+        seen_version = None
+        last_state = None
+        
+        with batch_lock:
+            job = batch_jobs.get(job_id)
+        
+        if not job:
+            yield f"data: {{\"error\": \"Job not found\"}}\n\n"
+            return
         
         while True:
             with batch_lock:
-                job = batch_jobs.get(job_id)
+                # Block until the worker reports progress past what this stream sent
+                if job["version"] == seen_version:
+                    batch_changed.wait(timeout=15.0)
+                if job["version"] == seen_version:
+                    update = None
+                else:
+                    seen_version = job["version"]
+                    update = _job_update(job, seen_log_lines)
+                    seen_log_lines = job["log_total"]
             
-            if not job:
-                yield f"data: {{\"error\": \"Job not found\"}}\n\n"
-                break
+            if update is None:
+                # Comment lines keep proxies from timing out
+                yield ": keepalive\n\n"
+                continue
             
-            # Send progress update
-            update = {
-                "status": job["status"],
-                "completed": job["completed"],
-                "total": job["total"],
-                "success": job["success"],
-                "failed": job["failed"],
-                "current": job["current"],
-                "new_log": job["log"][last_log_index:]
-            }
-            last_log_index = len(job["log"])
-            yield f"data: {json.dumps(update)}\n\n"
+            # A wake-up with nothing new only needs a heartbeat, not a re-serialized payload
+            state = (update["status"], update["completed"], update["success"], update["failed"], update["current"])
+            if state == last_state and not update["new_log"]:
+                yield ":\n\n"
+            else:
+                last_state = state
+                yield f"data: {dumps(update)}\n\n"
             
-            if job["status"] == "completed":
+            if update["status"] == "completed":
                 break
-            
-            time.sleep(0.5)
     
     return Response(generate(), mimetype='text/event-stream')
 
 
+def _job_update(job, seen_log_lines):
+    """Progress frame for a status stream, with only the log lines it has not seen.
+    
+    Caller holds batch_lock.
+    """
+    log = job["log"]
+    unseen = min(job["log_total"] - seen_log_lines, len(log))
+    return {
+        "status": job["status"],
+        "completed": job["completed"],
+        "total": job["total"],
+        "success": job["success"],
+        "failed": job["failed"],
+        "current": job["current"],
+        "new_log": list(islice(log, len(log) - unseen, None))
+    }
+
+
 @app.route('/api/batch/jobs')
 def api_batch_jobs():
     """Get list of all batch jobs."""
     with batch_lock:
-        jobs_list = list(batch_jobs.values())
+        jobs_list = [
+            dict(job, log=list(islice(job["log"], max(len(job["log"]) - HISTORY_LOG_LINES, 0), None)))
+            for job in batch_jobs.values()
+        ]
     
     # Sort by start time, newest first
     jobs_list.sort(key=lambda j: j["started"], reverse=True)
@@ -356,14 +639,14 @@ def api_batch_jobs():
 
 @app.route('/api/batch/stop/<job_id>', methods=['POST'])
 def api_batch_stop(job_id):
-    """Stop a running batch job."""
+    """Stop a queued or running batch job."""
     with batch_lock:
         job = batch_jobs.get(job_id)
     
     if not job:
         return jsonify({"error": "Job not found"}), 404
     
-    if job["status"] == "running":
+    if job["status"] in ("queued", "running"):
         job["stopped"] = True
         return jsonify({"success": True})
     else:
@@ -393,7 +676,11 @@ def api_schema():
         "technic_holes_json": "Array of pin/axle hole positions: [[x, y, z], ...]",
         "extraction_status": "Status: success, partial, failed, pending",
         "has_image": "Whether a rendered image exists (0 or 1)",
-        "image_path": "Absolute path to rendered PNG image"
+        "image_path": "Absolute path to rendered PNG image",
+        "stud_count": "Number of entries in studs_json (precomputed)",
+        "anti_stud_count": "Number of entries in anti_studs_json (precomputed)",
+        "technic_hole_count": "Number of entries in technic_holes_json (precomputed)",
+        "connection_count": "Number of entries in connection_points_json (precomputed)"
     }
     
     schema = []
@@ -410,6 +697,7 @@ def api_schema():
 
 
 @app.route('/api/distributions')
+@cached_on_catalog
 def api_distributions():
     """Get value distributions for all fields."""
     conn = get_db()
@@ -417,13 +705,6 @@ def api_distributions():
     distributions = {}
     
     # Categorical fields - pie chart data
-    # Category distribution
-    cursor = conn.execute("SELECT category, COUNT(*) FROM parts GROUP BY category")
-    distributions["category"] = {
-        "type": "categorical",
-        "values": [{"label": row[0], "count": row[1]} for row in cursor.fetchall()]
-    }
-    
     # Extraction status distribution
     cursor = conn.execute("SELECT extraction_status, COUNT(*) FROM parts GROUP BY extraction_status")
     distributions["extraction_status"] = {
@@ -471,11 +752,8 @@ def api_distributions():
         }
     
     # Stud count distribution
-    cursor = conn.execute("SELECT studs_json FROM parts WHERE studs_json IS NOT NULL")
-    stud_counts = []
-    for row in cursor.fetchall():
-        studs = json.loads(row[0]) if row[0] else []
-        stud_counts.append(len(studs))
+    cursor = conn.execute("SELECT stud_count FROM parts WHERE stud_count IS NOT NULL")
+    stud_counts = [row[0] for row in cursor.fetchall()]
     
     if stud_counts:
         distributions["stud_count"] = {
@@ -487,11 +765,8 @@ def api_distributions():
         }
     
     # Anti-stud count distribution
-    cursor = conn.execute("SELECT anti_studs_json FROM parts WHERE anti_studs_json IS NOT NULL")
-    anti_stud_counts = []
-    for row in cursor.fetchall():
-        anti_studs = json.loads(row[0]) if row[0] else []
-        anti_stud_counts.append(len(anti_studs))
+    cursor = conn.execute("SELECT anti_stud_count FROM parts WHERE anti_stud_count IS NOT NULL")
+    anti_stud_counts = [row[0] for row in cursor.fetchall()]
     
     if anti_stud_counts:
         distributions["anti_stud_count"] = {
@@ -503,11 +778,8 @@ def api_distributions():
         }
     
     # Technic hole count distribution
-    cursor = conn.execute("SELECT technic_holes_json FROM parts WHERE technic_holes_json IS NOT NULL")
-    technic_hole_counts = []
-    for row in cursor.fetchall():
-        technic_holes = json.loads(row[0]) if row[0] else []
-        technic_hole_counts.append(len(technic_holes))
+    cursor = conn.execute("SELECT technic_hole_count FROM parts WHERE technic_hole_count IS NOT NULL")
+    technic_hole_counts = [row[0] for row in cursor.fetchall()]
     
     if technic_hole_counts:
         distributions["technic_hole_count"] = {
@@ -519,22 +791,22 @@ def api_distributions():
         }
 
     # Connection Types distribution
-    cursor = conn.execute("SELECT connection_types_json FROM parts WHERE connection_types_json IS NOT NULL")
-    type_counts = {}
-    for row in cursor.fetchall():
-        types = json.loads(row[0]) if row[0] else []
-        for t in types:
-            type_counts[t] = type_counts.get(t, 0) + 1
-            
+    cursor = conn.execute("""
+        SELECT t.value, COUNT(*) as cnt
+        FROM parts, json_each(NULLIF(parts.connection_types_json, '')) AS t
+        GROUP BY t.value
+        ORDER BY cnt DESC
+    """)
     distributions["connection_types"] = {
         "type": "categorical",
-        "values": [{"label": k, "count": v} for k, v in sorted(type_counts.items(), key=lambda x: x[1], reverse=True)]
+        "values": [{"label": row[0], "count": row[1]} for row in cursor.fetchall()]
     }
     
     return jsonify({"distributions": distributions})
 
 
 @app.route('/api/stats')
+@cached_on_catalog
 def api_stats():
     """Get catalog statistics."""
     conn = get_db()
@@ -559,33 +831,16 @@ def api_stats():
             "with_images": row[2]
         }
     
-    # Connection point statistics
+    # Connection point statistics from the precomputed count columns
     cursor = conn.execute("""
-        SELECT studs_json, anti_studs_json, technic_holes_json
+        SELECT COALESCE(SUM(stud_count), 0), COALESCE(SUM(stud_count > 0), 0),
+               COALESCE(SUM(anti_stud_count), 0), COALESCE(SUM(anti_stud_count > 0), 0),
+               COALESCE(SUM(technic_hole_count), 0), COALESCE(SUM(technic_hole_count > 0), 0)
         FROM parts
     """)
-    
-    total_studs = 0
-    total_anti_studs = 0
-    total_technic_holes = 0
-    parts_with_studs = 0
-    parts_with_anti_studs = 0
-    parts_with_technic_holes = 0
-    
-    for row in cursor.fetchall():
-        studs = json.loads(row[0]) if row[0] else []
-        anti_studs = json.loads(row[1]) if row[1] else []
-        technic_holes = json.loads(row[2]) if row[2] else []
-        
-        if studs:
-            total_studs += len(studs)
-            parts_with_studs += 1
-        if anti_studs:
-            total_anti_studs += len(anti_studs)
-            parts_with_anti_studs += 1
-        if technic_holes:
-            total_technic_holes += len(technic_holes)
-            parts_with_technic_holes += 1
+    (total_studs, parts_with_studs,
+     total_anti_studs, parts_with_anti_studs,
+     total_technic_holes, parts_with_technic_holes) = cursor.fetchone()
     
     return jsonify({
         "total": stats["total"],
@@ -595,7 +850,7 @@ def api_stats():
             "failed": stats["failed"]
         },
         "images": {
-            "total_with_images": sum(c["with_images"] for c in categories.values()),
+            "total_with_images": stats["with_images"],
             "total_parts": stats["total"]
         },
         "categories": categories,
@@ -633,106 +888,35 @@ def api_parts():
     where_clauses = []
     params = []
     
-    # helper to check for explicit "select none"
-    def is_none(val):
-        return val == '_none_'
-
-    # Handle categories (comma-separated)
-    if categories is not None:
-        if is_none(categories):
+    # Handle categories, types, ldraw_org and extractions (comma-separated).
+    # Missing param = show all, '_none_' = explicit "select none", '_all_' = show all.
+    filters = (
+        ("category", categories, "(No Category)"),
+        ("type", types, None),
+        ("ldraw_org", ldraw_orgs, "None"),  # "None" in the UI maps to NULL, as in the distributions
+        ("extraction_status", extractions, None),
+    )
+    for col, raw, null_value in filters:
+        if raw is None or raw == '_all_':
+            continue
+        if raw == '_none_':
             where_clauses.append("1=0")
-        elif categories:
-            # Handle mixed usage of real categories and special "(No Category)"
-            cat_list = [c.strip() for c in categories.split(',')]
-            special_null = "(No Category)"
-            
-            real_cats = [c for c in cat_list if c != special_null]
-            has_null = special_null in cat_list
-            
-            conditions = []
-            if real_cats:
-                placeholders = ','.join(['?' for _ in real_cats])
-                conditions.append(f"category IN ({placeholders})")
-                params.extend(real_cats)
-            
-            if has_null:
-                conditions.append("category IS NULL")
-                
-            if conditions:
-                where_clauses.append(f"({' OR '.join(conditions)})")
-        
-    # Handle types (comma-separated)
-    # Logic: If param exists but empty -> Show All? No, frontend sends _none_ for none.
-    # If param missing (e.g. first load) -> Show All.
-    # If param has value -> Filter.
-    if types is not None:
-        if is_none(types):
-             where_clauses.append("1=0")
-        elif types:
-            # Check for "_all_" just in case, though frontend should just omit it
-            if types == '_all_':
-                pass 
-            else:
-                type_list = [t.strip() for t in types.split(',')]
-                # Special handling for "Other" or "Unknown" could go here if needed
-                # For now assuming simple text match
-                placeholders = ','.join(['?' for _ in type_list])
-                where_clauses.append(f"type IN ({placeholders})")
-                params.extend(type_list)
-    
-    # Handle ldraw_org (comma-separated)
-    if ldraw_orgs is not None:
-        if is_none(ldraw_orgs):
-             where_clauses.append("1=0")
-        elif ldraw_orgs:
-            # Check for "_all_" just in case
-            if ldraw_orgs == '_all_':
-                pass 
-            else:
-                org_list = [o.strip() for o in ldraw_orgs.split(',')]
-                
-                # Check for explicit "None" string if used in frontend for nulls
-                # Assuming "None" in the UI maps to NULL in DB for consistency with distribution
-                special_null = "None"
-                
-                real_orgs = [o for o in org_list if o != special_null]
-                has_null = special_null in org_list
-                
-                conditions = []
-                if real_orgs:
-                    placeholders = ','.join(['?' for _ in real_orgs])
-                    conditions.append(f"ldraw_org IN ({placeholders})")
-                    params.extend(real_orgs)
-                
-                if has_null:
-                    conditions.append("ldraw_org IS NULL")
-                
-                if conditions:
-                    where_clauses.append(f"({' OR '.join(conditions)})")
+        elif raw:
+            sql, filter_params = _in_clause(col, _split_list(raw), null_value=null_value)
+            where_clauses.append(sql)
+            params.extend(filter_params)
 
     # Handle images (comma-separated: yes, no)
     if images is not None:
-        if is_none(images):
+        if images == '_none_':
             where_clauses.append("1=0")
         elif images:
-            image_list = [i.strip() for i in images.split(',')]
-            image_conditions = []
-            if 'yes' in image_list:
-                image_conditions.append("has_image = 1")
-            if 'no' in image_list:
-                image_conditions.append("has_image = 0")
-            if image_conditions:
-                where_clauses.append(f"({' OR '.join(image_conditions)})")
-    
-    # Handle extractions (comma-separated)
-    if extractions is not None:
-        if is_none(extractions):
-            where_clauses.append("1=0")
-        elif extractions:
-            extraction_list = [e.strip() for e in extractions.split(',')]
-            placeholders = ','.join(['?' for _ in extraction_list])
-            where_clauses.append(f"extraction_status IN ({placeholders})")
-            params.extend(extraction_list)
+            flags = [_IMAGE_FLAGS[i] for i in _split_list(images) if i in _IMAGE_FLAGS]
+            if flags:
+                sql, filter_params = _in_clause("has_image", flags, universe=_IMAGE_FLAGS.values())
+                if sql != "1=1":
+                    where_clauses.append(sql)
+                    params.extend(filter_params)
     
     # Handle search (search both part_id and part_name)
     if search:
@@ -746,57 +930,56 @@ def api_parts():
     cursor = conn.execute(f"SELECT COUNT(*) FROM parts WHERE {where_sql}", params)
     total = cursor.fetchone()[0]
     
-    # Get parts
-    cursor = conn.execute(f"""
-        SELECT part_id, part_name, type, category, ldraw_org, height, has_image, image_path, extraction_status,
-               studs_json, anti_studs_json, technic_holes_json, connection_points_json
-        FROM parts
-        WHERE {where_sql}
-        ORDER BY part_id
-        LIMIT ? OFFSET ?
-    """, params + [limit, offset])
+    pagination = {
+        "page": page,
+        "limit": limit,
+        "total": total,
+        "pages": (total + limit - 1) // limit
+    }
     
-    parts = []
-    for row in cursor.fetchall():
-        # Indices based on: part_id(0), part_name(1), type(2), category(3), ldraw_org(4), 
-        # height(5), has_image(6), image_path(7), extraction_status(8), 
-        # studs_json(9), anti_studs_json(10), technic_holes_json(11)
-        studs = json.loads(row[9]) if row[9] else []
-        anti_studs = json.loads(row[10]) if row[10] else []
-        technic_holes = json.loads(row[11]) if row[11] else []
-        connection_points = json.loads(row[12]) if row[12] else []
+    # Stream rows out as SQLite produces them instead of building the whole list first.
+    # The request's connection is closed at teardown, before the body is sent, so the
+    # generator reads through this thread's read-only connection (no init_db pass).
+    def generate():
+        # Get parts
+        cursor = get_read_db().execute(f"""
+            SELECT part_id, part_name, type, category, ldraw_org, height, has_image, image_path, extraction_status,
+                   stud_count, anti_stud_count, technic_hole_count, connection_count
+            FROM parts
+            WHERE {where_sql}
+            ORDER BY part_id
+            LIMIT ? OFFSET ?
+        """, params + [limit, offset])
         
-        parts.append({
-            "part_id": row[0],
-            "part_name": row[1] or row[0],
-            "type": row[2],
-            "category": row[3],
-            "ldraw_org": row[4],
-            "height": row[5],
-            "has_image": bool(row[6]),
-            "image_path": row[7],
-            "extraction_status": row[8],
-            "stud_count": len(studs),
-            "anti_stud_count": len(anti_studs),
-            "technic_hole_count": len(technic_holes),
-            "connection_count": len(connection_points)
-        })
+        yield '{"parts":['
+        for i, row in enumerate(cursor):
+            # Indices based on: part_id(0), part_name(1), type(2), category(3), ldraw_org(4), 
+            # height(5), has_image(6), image_path(7), extraction_status(8), 
+            # stud_count(9), anti_stud_count(10), technic_hole_count(11), connection_count(12)
+            part = {
+                "part_id": row[0],
+                "part_name": row[1] or row[0],
+                "type": row[2],
+                "category": row[3],
+                "ldraw_org": row[4],
+                "height": row[5],
+                "has_image": bool(row[6]),
+                "image_path": row[7],
+                "extraction_status": row[8],
+                "stud_count": row[9] or 0,
+                "anti_stud_count": row[10] or 0,
+                "technic_hole_count": row[11] or 0,
+                "connection_count": row[12] or 0
+            }
+            yield ("," if i else "") + dumps(part)
+        yield '],"pagination":' + dumps(pagination) + '}'
     
-    return jsonify({
-        "parts": parts,
-        "pagination": {
-            "page": page,
-            "limit": limit,
-            "total": total,
-            "pages": (total + limit - 1) // limit
-        }
-    })
+    return Response(generate(), mimetype='application/json')
 
 
 @app.route('/api/parts/<part_id>')
 def api_part_detail(part_id):
     """Get detailed info for a single part."""
-    from validator.config import get_parts_dir
     conn = get_db()
     part = load_part(conn, part_id)
     
@@ -806,7 +989,7 @@ def api_part_detail(part_id):
     # Try to load raw LDraw content
     raw_content = ""
     try:
-        part_path = get_parts_dir() / f"{part_id}.dat"
+        part_path = PARTS_DIR / f"{part_id}.dat"
         if part_path.exists():
             with open(part_path, 'r', encoding='utf-8', errors='ignore') as f:
                 lines = f.readlines()
@@ -835,18 +1018,66 @@ def api_part_detail(part_id):
     })
 
 
+# Browsers reuse part images this long without asking; after that the mtime-based
+# ETag turns a re-request into a 304. Kept short because re-renders reuse the URL.
+IMAGE_MAX_AGE = 300
+
+# Hand image bodies to the front-end server instead of streaming them from Python:
+#   USE_X_SENDFILE=1                    Apache mod_xsendfile / lighttpd (X-Sendfile)
+#   X_ACCEL_REDIRECT_PREFIX=/_images/   nginx, with `location /_images/ { internal; alias <project>/data/; }`
+app.config['USE_X_SENDFILE'] = os.environ.get('USE_X_SENDFILE') == '1'
+X_ACCEL_REDIRECT_PREFIX = os.environ.get('X_ACCEL_REDIRECT_PREFIX')
+DATA_DIR = PROJECT_ROOT / "data"
+
+
+# The placeholder never changes while the server runs, so it is read (and hashed) once
+try:
+    _PLACEHOLDER_BYTES = PLACEHOLDER_PATH.read_bytes()
+    _PLACEHOLDER_ETAG = hashlib.md5(_PLACEHOLDER_BYTES).hexdigest()
+except FileNotFoundError:
+    _PLACEHOLDER_BYTES = None
+
+
+def send_bytes(data, mimetype, etag, encoding=None, no_cache=False):
+    """Response for an in-memory body with a precomputed ETag; If-None-Match gets a 304."""
+    response = Response(data, mimetype=mimetype)
+    if encoding:
+        response.content_encoding = encoding
+    if no_cache:
+        response.cache_control.no_cache = True
+    response.set_etag(etag)
+    return response.make_conditional(request)
+
+
+def send_image(image_path, max_age=IMAGE_MAX_AGE):
+    """Serve a PNG with zero-copy delivery where the deployment supports it."""
+    if X_ACCEL_REDIRECT_PREFIX:
+        try:
+            rel_path = Path(image_path).resolve().relative_to(DATA_DIR)
+        except ValueError:
+            pass  # outside data/; stream it from here
+        else:
+            response = Response(mimetype='image/png')
+            response.headers['X-Accel-Redirect'] = X_ACCEL_REDIRECT_PREFIX + rel_path.as_posix()
+            response.cache_control.public = True
+            response.cache_control.max_age = max_age
+            return response
+    # send_file streams through wsgi.file_wrapper, or emits X-Sendfile if enabled
+    return send_file(image_path, mimetype='image/png', max_age=max_age, conditional=True)
+
+
 @app.route('/api/images/<part_id>.png')
 def api_image(part_id):
     """Serve part image with priority: rendered > downloaded > placeholder."""
-    project_root = Path(__file__).parent.parent
-    
     # Priority 1: Check user-rendered images (highest priority)
-    rendered_path = project_root / "data" / "rendered_images" / f"{part_id}.png"
-    if rendered_path.exists():
-        return send_file(rendered_path, mimetype='image/png')
+    if part_id in RENDERED_INDEX:
+        try:
+            return send_image(RENDERED_DIR / f"{part_id}.png")
+        except FileNotFoundError:
+            RENDERED_INDEX.discard(part_id)  # deleted since it was indexed
     
     # Priority 2: Check database for downloaded image path
-    conn = get_db()
+    conn = get_read_db()
     cursor = conn.execute("SELECT image_path, has_image FROM parts WHERE part_id = ?", (part_id,))
     row = cursor.fetchone()
     
@@ -856,20 +1087,19 @@ def api_image(part_id):
             image_path = Path(path_str)
             
             if not image_path.is_absolute():
-                image_path = project_root / path_str
+                image_path = PROJECT_ROOT / path_str
                 
             if image_path.exists():
-                return send_file(image_path, mimetype='image/png')
+                return send_image(image_path)
     
     # Priority 3: Check part_images as fallback (in case DB is not updated)
-    part_images_path = project_root / "data" / "part_images" / f"{part_id}.png"
+    part_images_path = PROJECT_ROOT / "data" / "part_images" / f"{part_id}.png"
     if part_images_path.exists():
-        return send_file(part_images_path, mimetype='image/png')
+        return send_image(part_images_path)
 
-    # Priority 4: Return placeholder
-    placeholder = Path(__file__).parent / "static" / "placeholder.png"
-    if placeholder.exists():
-        return send_file(placeholder, mimetype='image/png')
+    # Priority 4: Return placeholder (no-cache so a later render shows up; revalidation is a 304)
+    if _PLACEHOLDER_BYTES is not None:
+        return send_bytes(_PLACEHOLDER_BYTES, 'image/png', _PLACEHOLDER_ETAG, no_cache=True)
     else:
         return "No image", 404
 
@@ -877,29 +1107,52 @@ def api_image(part_id):
 @app.route('/api/parts/<part_id>/ldraw')
 def api_part_ldraw(part_id):
     """Serve raw LDraw file content for 3D viewing."""
-    from validator.config import get_parts_dir
-    
     # Try to find the part file
-    parts_dir = get_parts_dir()
-    part_file = parts_dir / f"{part_id}.dat"
+    part_file = PARTS_DIR / f"{part_id}.dat"
     
-    if not part_file.exists():
+    try:
+        mtime_ns = os.stat(part_file).st_mtime_ns
+        data = _read_ldraw(str(part_file), mtime_ns)
+    except FileNotFoundError:
         return jsonify({"error": "LDraw file not found"}), 404
     
-    try:
-        with open(part_file, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
-        return Response(content, mimetype='text/plain')
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    etag = f"{mtime_ns}-{len(data)}"
+    encoding = None
+    if len(data) >= GZIP_MIN_SIZE and request.accept_encodings['gzip']:
+        data, encoding = _gzip_ldraw(str(part_file), mtime_ns), 'gzip'
+        etag += "-gz"  # a different representation needs its own ETag
+    
+    response = send_bytes(data, 'text/plain', etag, encoding=encoding)
+    response.vary.add('Accept-Encoding')
+    return response
+
+
+@lru_cache(maxsize=512)
+def _read_ldraw(path_str: str, mtime_ns: int) -> bytes:
+    """Bytes of a part file; keyed on mtime so an edited file is re-read."""
+    with open(path_str, 'rb') as f:
+        return f.read()
+
+
+@lru_cache(maxsize=512)
+def _gzip_ldraw(path_str: str, mtime_ns: int) -> bytes:
+    """Gzipped bytes of a part file, so popular parts are compressed once."""
+    return gzip.compress(_read_ldraw(path_str, mtime_ns), compresslevel=6, mtime=0)
+
+
+# LDView runs on this pool, so the number of concurrent LDView processes is capped
+# regardless of how many request or batch threads want renders.
+RENDER_POOL = ThreadPoolExecutor(max_workers=max(1, (os.cpu_count() or 2) // 2), thread_name_prefix="render")
+
+# Renders in progress: part_id -> RENDER_POOL Future of (response body, status code).
+# Concurrent requests for the same part wait on the first one's render.
+_render_inflight = {}
+_render_lock = threading.Lock()
 
 
 @app.route('/api/parts/<part_id>/render', methods=['POST'])
 def api_render_part(part_id):
     """Render a part image on-demand using LDView."""
-    from validator.scene_graph import SceneGraph, Placement
-    from validator.renderer import render_scene
-    
     conn = get_db()
     
     # Check if part exists
@@ -907,66 +1160,186 @@ def api_render_part(part_id):
     if not part:
         return jsonify({"error": "Part not found"}), 404
     
+    # Already rendered (e.g. a double click): skip LDView, just make sure the DB agrees
+    output_path = RENDERED_DIR / f"{part_id}.png"
     try:
-        # Create scene with single part
-        sg = SceneGraph()
-        sg.add_placement(Placement(
-            part_id=part_id,
-            color=16,  # Main color (default)
-            position=(0.0, 0.0, 0.0),
-            rotation=(1.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 1.0)
-        ))
-        
-        # Render to file
-        project_root = Path(__file__).parent.parent
-        output_dir = project_root / "data" / "rendered_images"
-        output_dir.mkdir(parents=True, exist_ok=True)
-        output_path = output_dir / f"{part_id}.png"
-        
-        print(f"[RENDER] Attempting to render {part_id} to {output_path}")
-        success = render_scene(sg, str(output_path), width=400, height=400)
-        
-        if not success:
-            print(f"[RENDER] Failed to render {part_id}")
-            return jsonify({
-                "success": False,
-                "error": "LDView rendering failed"
-            }), 500
-        
-        # Check if file was created
-        if not output_path.exists():
-            print(f"[RENDER] Output file not created: {output_path}")
-            return jsonify({
-                "success": False,
-                "error": "Output file not created"
-            }), 500
-        
-        print(f"[RENDER] Successfully rendered {part_id}, file size: {output_path.stat().st_size} bytes")
-        
-        # Update database
-        rel_path = f"data/rendered_images/{part_id}.png"
-        conn.execute(
-            "UPDATE parts SET has_image = 1, image_path = ? WHERE part_id = ?",
-            (rel_path, part_id)
-        )
-        conn.commit()
+        already_rendered = output_path.stat().st_size > 0
+    except FileNotFoundError:
+        already_rendered = False
+    if already_rendered:
+        _record_rendered_image(conn, part_id)
+        return _rendered_response(part_id)
+    
+    with _render_lock:
+        future = _render_inflight.get(part_id)
+        is_leader = future is None
+        if is_leader:
+            future = RENDER_POOL.submit(_render_part_image, part_id)
+            _render_inflight[part_id] = future
+    
+    try:
+        try:
+            body, status = future.result()
+        finally:
+            if is_leader:
+                with _render_lock:
+                    _render_inflight.pop(part_id, None)
         
-        return jsonify({
-            "success": True,
-            "message": f"Rendered {part_id}",
-            "image_url": f"/api/images/{part_id}.png"
-        })
+        if is_leader and body["success"]:
+            _record_rendered_image(conn, part_id)
         
+        return jsonify(body), status
     except Exception as e:
-        import traceback
-        print(f"[RENDER] Exception: {e}")
-        print(traceback.format_exc())
+        app.logger.exception("RENDER %s failed", part_id)
         return jsonify({
             "success": False,
             "error": str(e)
         }), 500
 
 
+# Upper bound on part ids per /api/parts/render_batch request (one LDView run)
+MAX_RENDER_BATCH = 64
+
+
+@app.route('/api/parts/render_batch', methods=['POST'])
+def api_render_parts():
+    """Render several part images with a single LDView process.
+    
+    Body: {"part_ids": [...]}. Returns {"images": {part_id: image_url}, "failed": [part_id]}.
+    """
+    payload = request.get_json(silent=True) or {}
+    part_ids = payload.get("part_ids")
+    if not isinstance(part_ids, list) or not all(isinstance(p, str) for p in part_ids):
+        return jsonify({"error": "part_ids must be a list of strings"}), 400
+    part_ids = list(dict.fromkeys(part_ids))
+    if len(part_ids) > MAX_RENDER_BATCH:
+        return jsonify({"error": f"At most {MAX_RENDER_BATCH} parts per batch"}), 400
+    
+    conn = get_db()
+    known = set()
+    if part_ids:
+        placeholders = ','.join('?' * len(part_ids))
+        known = {row[0] for row in conn.execute(
+            f"SELECT part_id FROM parts WHERE part_id IN ({placeholders})", part_ids
+        )}
+    
+    images, failed = {}, []
+    pending = {}  # part_id -> Future shared with api_render_part
+    to_render = []
+    for part_id in part_ids:
+        if part_id not in known:
+            failed.append(part_id)
+            continue
+        try:
+            already_rendered = (RENDERED_DIR / f"{part_id}.png").stat().st_size > 0
+        except FileNotFoundError:
+            already_rendered = False
+        if already_rendered:
+            _record_rendered_image(conn, part_id)
+            images[part_id] = f"/api/images/{part_id}.png"
+            continue
+        with _render_lock:
+            future = _render_inflight.get(part_id)
+            if future is None:
+                future = Future()
+                _render_inflight[part_id] = future
+                to_render.append(part_id)
+        pending[part_id] = future
+    
+    if to_render:
+        rendered = {}
+        try:
+            rendered = RENDER_POOL.submit(
+                render_parts, to_render, str(RENDERED_DIR), width=400, height=400, silent_errors=True
+            ).result()
+        finally:
+            # Always resolve our futures, so single-part requests waiting on them return
+            for part_id in to_render:
+                if rendered.get(part_id):
+                    _record_rendered_image(conn, part_id)
+                    result = ({
+                        "success": True,
+                        "message": f"Rendered {part_id}",
+                        "image_url": f"/api/images/{part_id}.png"
+                    }, 200)
+                else:
+                    result = ({"success": False, "error": "LDView rendering failed"}, 500)
+                with _render_lock:
+                    _render_inflight.pop(part_id, None)
+                pending[part_id].set_result(result)
+    
+    for part_id, future in pending.items():
+        body, _ = future.result()
+        if body["success"]:
+            images[part_id] = body["image_url"]
+        else:
+            failed.append(part_id)
+    
+    return jsonify({"images": images, "failed": failed})
+
+
+# Part ids that can be pasted into a JSON string literal without escaping
+_PLAIN_PART_ID = re.compile(r'[A-Za-z0-9_.\-]+')
+
+
+def _rendered_response(part_id):
+    """Success body for an already-rendered part, formatted without a JSON encoder."""
+    if not _PLAIN_PART_ID.fullmatch(part_id):
+        return Response(dumps({
+            "success": True,
+            "message": f"Rendered {part_id}",
+            "image_url": f"/api/images/{part_id}.png"
+        }), mimetype='application/json')
+    body = f'{{"success":true,"message":"Rendered {part_id}","image_url":"/api/images/{part_id}.png"}}'
+    return Response(body, mimetype='application/json')
+
+
+def _record_rendered_image(conn, part_id):
+    """Point the part's DB row at its rendered image (no write if it already does)."""
+    RENDERED_INDEX.add(part_id)
+    rel_path = f"data/rendered_images/{part_id}.png"
+    row = conn.execute("SELECT has_image, image_path FROM parts WHERE part_id = ?", (part_id,)).fetchone()
+    if row is None or (row[0] == 1 and row[1] == rel_path):
+        return
+    with conn:
+        conn.execute(
+            "UPDATE parts SET has_image = 1, image_path = ? WHERE part_id = ?",
+            (rel_path, part_id)
+        )
+    invalidate_response_cache()
+
+
+def _render_part_image(part_id):
+    """Render one part with LDView (runs on RENDER_POOL); returns (response body, status)."""
+    output_path = RENDERED_DIR / f"{part_id}.png"
+    
+    app.logger.debug("RENDER %s -> %s", part_id, output_path)
+    success = render_single_part(part_id, str(output_path), width=400, height=400)
+    
+    if not success:
+        app.logger.warning("RENDER %s: LDView rendering failed", part_id)
+        return {
+            "success": False,
+            "error": "LDView rendering failed"
+        }, 500
+    
+    # Check if file was created
+    if not output_path.exists():
+        app.logger.warning("RENDER %s: output file not created: %s", part_id, output_path)
+        return {
+            "success": False,
+            "error": "Output file not created"
+        }, 500
+    
+    app.logger.debug("RENDER %s done", part_id)
+    
+    return {
+        "success": True,
+        "message": f"Rendered {part_id}",
+        "image_url": f"/api/images/{part_id}.png"
+    }, 200
+
+
 @app.route('/tests')
 def tests_page():
     """Render the test explorer page."""
@@ -976,9 +1349,8 @@ def tests_page():
 @app.route('/api/tests')
 def api_tests():
     """Get summarized test results from the log file and manifest."""
-    project_root = Path(__file__).parent.parent
-    log_path = project_root / "test_renders" / "visualize_tests.log"
-    manifest_path = project_root / "test_data" / "manifest.json"
+    log_path = PROJECT_ROOT / "test_renders" / "visualize_tests.log"
+    manifest_path = PROJECT_ROOT / "test_data" / "manifest.json"
     
     if not log_path.exists():
         return jsonify({"error": "Test log not found. Run scripts/visualize_tests.py first."}), 404
@@ -1024,7 +1396,7 @@ def api_tests():
                 current_test["details"].append(line)
                 
         # Map images and manifest files
-        render_dir = project_root / "test_renders"
+        render_dir = PROJECT_ROOT / "test_renders"
         image_files = list(render_dir.glob("*.png"))
         
         test_case_map = {tc["id"]: tc for tc in manifest.get("test_cases", [])}
@@ -1052,15 +1424,14 @@ def api_tests():
             }
         })
     except Exception as e:
-        import traceback
-        print(traceback.format_exc())
+        app.logger.exception("Failed to summarize test results")
         return jsonify({"error": str(e)}), 500
 
 
 @app.route('/api/tests/renders/<filename>')
 def api_test_render(filename):
     """Serve a test render image."""
-    image_path = Path(__file__).parent.parent / "test_renders" / filename
+    image_path = PROJECT_ROOT / "test_renders" / filename
     if image_path.exists():
         return send_file(image_path, mimetype='image/png')
     return "Not found", 404
@@ -1069,7 +1440,7 @@ def api_test_render(filename):
 @app.route('/api/tests/files/<path:filename>')
 def api_test_file(filename):
     """Serve a test LDraw file content."""
-    file_path = Path(__file__).parent.parent / "test_data" / filename
+    file_path = PROJECT_ROOT / "test_data" / filename
     if not file_path.exists():
         return "Not found", 404
         
@@ -1082,6 +1453,8 @@ def api_test_file(filename):
 
 
 if __name__ == '__main__':
-    print("Starting LDraw Catalog Viewer...")
+    # Local development only; web/serve.py is the multi-threaded production entry point.
+    # FLASK_DEBUG=1 turns on the reloader and debugger.
+    print("Starting LDraw Catalog Viewer (development server; use web/serve.py in production)...")
     print("Open http://localhost:5000 in your browser")
-    app.run(debug=True, port=5000)
+    app.run(debug=os.environ.get('FLASK_DEBUG') == '1', port=5000, threaded=True)
@@ -0,0 +1,43 @@
+"""
+Production entry point for the catalog viewer.
+
+Runs the app in ONE process with a thread pool: batch jobs, in-flight
+renders and the response cache live in app.py's memory, so extra worker
+processes would not see each other's jobs.
+
+Uses waitress (pip install .[serve]) when installed; it runs on Windows
+and Linux and serves files through wsgi.file_wrapper. Otherwise falls
+back to Werkzeug's threaded server with the debugger off.
+
+    python web/serve.py            # http://127.0.0.1:5000
+    HOST=0.0.0.0 PORT=8080 THREADS=16 python web/serve.py
+"""
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app import app
+
+
+def main():
+    # Localhost only unless the deployment opts in (e.g. HOST=0.0.0.0 behind a proxy):
+    # the render and batch endpoints are unauthenticated
+    host = os.environ.get("HOST", "127.0.0.1")
+    port = int(os.environ.get("PORT", "5000"))
+    threads = int(os.environ.get("THREADS", "8"))
+
+    try:
+        from waitress import serve
+    except ImportError:
+        print("waitress not installed; using Werkzeug's threaded server (pip install .[serve])")
+        app.run(host=host, port=port, threaded=True, debug=False)
+        return
+
+    print(f"Serving LDraw Catalog Viewer on http://{host}:{port} ({threads} threads)")
+    serve(app, host=host, port=port, threads=threads)
+
+
+if __name__ == '__main__':
+    main()